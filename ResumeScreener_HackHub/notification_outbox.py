@@ -0,0 +1,311 @@
+import argparse
+import hashlib
+import logging
+import os
+import smtplib
+import sqlite3
+import tempfile
+import threading
+import time
+from email.mime.text import MIMEText
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger("notification-outbox")
+
+OUTBOX_PATH = os.getenv("SCREENER_OUTBOX_PATH", ".outbox/outbox.sqlite3")
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_SSL = os.getenv("SMTP_SSL", "true").lower() == "true"
+RATE_PER_SECOND = float(os.getenv("SMTP_RATE_PER_SECOND", "2"))
+MAX_ATTEMPTS = int(os.getenv("SMTP_MAX_ATTEMPTS", "5"))
+RETRY_BACKOFF = 30.0
+BATCH_SIZE = 50
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+
+class Outbox:
+    """Persistent SQLite queue of outgoing emails.
+
+    Messages are deduplicated by a hash of (recipient, content), so re-running a
+    screen does not email a candidate twice. Failed messages are retried with
+    exponential backoff and moved to the dead letters after `max_attempts`.
+    """
+
+    def __init__(self, path=OUTBOX_PATH, max_attempts=MAX_ATTEMPTS, retry_backoff=RETRY_BACKOFF):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, dedupe_key TEXT UNIQUE, sender TEXT, recipient TEXT, "
+            "message TEXT, status TEXT, attempts INTEGER DEFAULT 0, next_attempt REAL, last_error TEXT, "
+            "created REAL, sent_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt)")
+        self._db.commit()
+
+    def enqueue(self, sender, recipient, message, dedupe_text=None):
+        """Queue a message (a full RFC 822 string). Returns False if the same message was queued before.
+
+        `dedupe_text` replaces the message in the dedupe key, for messages whose
+        serialization varies between runs (e.g. random MIME boundaries).
+        """
+        dedupe_text = message if dedupe_text is None else dedupe_text
+        dedupe_key = hashlib.sha256(f"{recipient}\0{dedupe_text}".encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO outbox (dedupe_key, sender, recipient, message, status, next_attempt, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (dedupe_key, sender, recipient, message, PENDING, now, now),
+            )
+            self._db.commit()
+            return cursor.rowcount == 1
+
+    def due(self, limit=BATCH_SIZE):
+        """Pending messages whose next attempt is due, oldest first, as (id, sender, recipient, message)."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, sender, recipient, message FROM outbox WHERE status = ? AND next_attempt <= ? "
+                "ORDER BY id LIMIT ?",
+                (PENDING, time.time(), limit),
+            ).fetchall()
+
+    def mark_sent(self, message_id):
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, sent_at = ? WHERE id = ?",
+                (SENT, time.time(), message_id),
+            )
+            self._db.commit()
+
+    def mark_failed(self, message_id, error, permanent=False):
+        """Schedule a retry, or dead-letter the message if it is permanent or out of attempts."""
+        with self._lock:
+            attempts = self._db.execute("SELECT attempts FROM outbox WHERE id = ?", (message_id,)).fetchone()[0] + 1
+            status = DEAD if permanent or attempts >= self.max_attempts else PENDING
+            next_attempt = time.time() + self.retry_backoff * 2 ** (attempts - 1)
+            self._db.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                (status, attempts, next_attempt, str(error), message_id),
+            )
+            self._db.commit()
+            return status
+
+    def counts(self):
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {PENDING: 0, SENT: 0, DEAD: 0}
+        counts.update(rows)
+        return counts
+
+    def dead_letters(self, limit=100):
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, recipient, attempts, last_error FROM outbox WHERE status = ? ORDER BY id DESC LIMIT ?",
+                (DEAD, limit),
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class OutboxSender:
+    """Background thread that drains an Outbox over one reused, authenticated SMTP connection.
+
+    Sends are spaced to at most `rate_per_second`. Recipient and message
+    rejections are dead-lettered at once, other errors retried by the outbox.
+    A connection error ends the current batch; the connection is reopened at
+    the next poll, so an outage costs each message at most one attempt per poll.
+    """
+
+    def __init__(self, outbox, host=SMTP_HOST, port=SMTP_PORT, username=None, password=None, use_ssl=SMTP_SSL,
+                 rate_per_second=RATE_PER_SECOND, poll_interval=1.0):
+        self.outbox = outbox
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+        self.connections = 0
+        self.send_time = 0.0
+        self._smtp = None
+        self._last_send = 0.0
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="outbox-sender", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wake(self):
+        """Start sending right away instead of at the next poll."""
+        self._wake.set()
+
+    def stop(self, timeout=10.0):
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def drain(self, timeout=60.0):
+        """Block until no message is due or `timeout` expires; returns True if the outbox was drained."""
+        self.wake()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.outbox.due(limit=1):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def stats(self):
+        # messages_per_sec is over time spent in successful sendmail calls only, i.e. the connection's
+        # capacity; rate limiting, reconnects and failed attempts are not counted
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "dead": self.dead,
+            "connections": self.connections,
+            "messages_per_sec": self.sent / self.send_time if self.send_time else 0.0,
+        }
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self.outbox.due()
+            if not batch:
+                self._close()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            for message_id, sender, recipient, message in batch:
+                if self._stopping.is_set():
+                    break
+                if not self._send(message_id, sender, recipient, message):
+                    # The server is unreachable; retry the rest at the next poll rather than reconnecting for each
+                    self._stopping.wait(self.poll_interval)
+                    break
+        self._close()
+
+    def _send(self, message_id, sender, recipient, message):
+        """Send one message; returns False if the connection failed."""
+        wait = self._last_send + self.interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_send = time.monotonic()
+        try:
+            connection = self._connection()
+            start = time.perf_counter()
+            connection.sendmail(sender, [recipient], message)
+            elapsed = time.perf_counter() - start
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+            self._failed(message_id, recipient, e, permanent=isinstance(e, smtplib.SMTPRecipientsRefused))
+        except (smtplib.SMTPException, OSError) as e:
+            # The connection may be unusable now; reopen it at the next poll
+            self._close()
+            self._failed(message_id, recipient, e)
+            return False
+        else:
+            self.send_time += elapsed
+            self.outbox.mark_sent(message_id)
+            self.sent += 1
+        return True
+
+    def _failed(self, message_id, recipient, error, permanent=False):
+        self.failed += 1
+        if self.outbox.mark_failed(message_id, error, permanent) == DEAD:
+            self.dead += 1
+            logger.error(f"Dead-lettered email to {recipient}: {error}")
+        else:
+            logger.warning(f"Email to {recipient} failed, will retry: {error}")
+
+    def _connection(self):
+        if self._smtp is None:
+            smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+            self._smtp = smtp_class(self.host, self.port, timeout=30)
+            if self.username:
+                self._smtp.login(self.username, self.password)
+            self.connections += 1
+        return self._smtp
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def bench(count, rate_per_second, fail_every):
+    """Send `count` messages through the outbox to a local aiosmtpd server and report throughput."""
+    from aiosmtpd.controller import Controller
+
+    class Handler:
+        def __init__(self):
+            self.received = 0
+
+        async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+            # Reject some recipients to exercise dead-lettering
+            if fail_every and address.startswith("reject"):
+                return "550 No such user"
+            envelope.rcpt_tos.append(address)
+            return "250 OK"
+
+        async def handle_DATA(self, server, session, envelope):
+            self.received += 1
+            return "250 Message accepted"
+
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=8025)
+    controller.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            outbox = Outbox(os.path.join(directory, "outbox.sqlite3"))
+            for i in range(count):
+                recipient = f"reject{i}@example.com" if fail_every and i % fail_every == 0 else f"candidate{i}@example.com"
+                message = MIMEText(f"Benchmark message {i}")
+                message["Subject"] = "Application Status"
+                message["From"] = "hr@example.com"
+                message["To"] = recipient
+                outbox.enqueue("hr@example.com", recipient, message.as_string())
+
+            sender = OutboxSender(outbox, host="127.0.0.1", port=8025, use_ssl=False, rate_per_second=rate_per_second)
+            start = time.perf_counter()
+            sender.start()
+            sender.drain(timeout=max(60.0, 2 * count / rate_per_second if rate_per_second else 60.0))
+            elapsed = time.perf_counter() - start
+            sender.stop()
+            stats = sender.stats()
+            print(f"Sent {stats['sent']}/{count} messages in {elapsed:.2f}s ({stats['sent'] / elapsed:.1f} messages/sec) "
+                  f"over {stats['connections']} SMTP connection(s)")
+            print(f"Failures: {stats['failed']}, dead-lettered: {stats['dead']}, received by server: {handler.received}")
+            print(f"Outbox: {outbox.counts()}")
+            outbox.close()
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the notification outbox against a local aiosmtpd server.")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=0, help="messages/sec limit (0 = unlimited)")
+    parser.add_argument("--fail-every", type=int, default=50, help="reject every Nth recipient (0 = never)")
+    args = parser.parse_args()
+    bench(args.count, args.rate, args.fail_every)
@@ -0,0 +1,111 @@
+import importlib.util
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Extraction backend and budget, overridable from .env. "auto" picks the fastest installed backend;
+# a budget of 0 means no limit
+BACKEND = os.getenv("SCREENER_PDF_BACKEND", "auto")
+MAX_PAGES = int(os.getenv("SCREENER_PDF_MAX_PAGES", "10"))
+MAX_CHARS = int(os.getenv("SCREENER_PDF_MAX_CHARS", "50000"))
+
+
+def _pypdfium2_pages(data):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(data)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                # PDFium ends lines with \r\n; the rest of the screener splits on \n
+                yield textpage.get_text_range().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _pdfminer_pages(data):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LAParams, LTTextContainer
+
+    # Layout analysis groups lines into text boxes in reading order, which keeps multi-column resumes readable
+    for layout in extract_pages(io.BytesIO(data), laparams=LAParams()):
+        yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+def _pypdf2_pages(data):
+    import PyPDF2
+
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        yield page.extract_text() or ""
+
+
+# Fastest first; each backend is used only if its package is installed
+BACKENDS = {
+    "pypdfium2": (_pypdfium2_pages, "pypdfium2"),
+    "pdfminer": (_pdfminer_pages, "pdfminer"),
+    "pypdf2": (_pypdf2_pages, "PyPDF2"),
+}
+
+
+def available_backends():
+    return [name for name, (_, module) in BACKENDS.items() if importlib.util.find_spec(module) is not None]
+
+
+def resolve_backend(backend=BACKEND):
+    """Name of the backend to use: `backend` itself, or the fastest installed one for "auto"."""
+    available = available_backends()
+    if backend == "auto":
+        if not available:
+            raise RuntimeError("No PDF backend installed; install pypdfium2, pdfminer.six or PyPDF2")
+        return available[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; choose from auto, {', '.join(BACKENDS)}")
+    if backend not in available:
+        raise RuntimeError(f"PDF backend {backend!r} is not installed")
+    return backend
+
+
+def extractor_id(backend=BACKEND, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """Identifies what text extraction produces, for cache keys: changing backend or budget is a new entry."""
+    return f"{resolve_backend(backend)}:{max_pages}:{max_chars}"
+
+
+def iter_pages(data, backend=BACKEND, max_pages=MAX_PAGES):
+    """Yield the text of each page of a PDF given as bytes, parsing a page only when it is asked for."""
+    pages, _ = BACKENDS[resolve_backend(backend)]
+    for i, text in enumerate(pages(data)):
+        if max_pages and i >= max_pages:
+            break
+        yield text
+
+
+def extract_text(data, backend=BACKEND, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """Text of a PDF given as bytes, stopping once `max_pages` pages or `max_chars` characters are read."""
+    parts = []
+    total = 0
+    for text in iter_pages(data, backend, max_pages):
+        parts.append(text)
+        total += len(text) + 1
+        if max_chars and total >= max_chars:
+            break
+    text = "\n".join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def extract_batch(documents, backend=BACKEND, max_pages=MAX_PAGES, max_chars=MAX_CHARS, executor=None):
+    """Extract many PDFs (a list of bytes) in parallel worker processes; returns texts in order."""
+    if executor is None:
+        with ProcessPoolExecutor() as pool:
+            return extract_batch(documents, backend, max_pages, max_chars, pool)
+    count = len(documents)
+    backends = [resolve_backend(backend)] * count
+    return list(executor.map(extract_text, documents, backends, [max_pages] * count, [max_chars] * count))
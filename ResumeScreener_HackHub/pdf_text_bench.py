@@ -0,0 +1,57 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_text import available_backends, extract_batch, iter_pages
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SampleResumes")
+
+
+def time_sequential(documents, backend, repeat):
+    """Pages/sec and characters extracted reading every page of every document, one after another."""
+    pages = chars = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in documents:
+            for text in iter_pages(data, backend, max_pages=0):
+                pages += 1
+                chars += len(text)
+    elapsed = time.perf_counter() - start
+    return pages / elapsed, chars // repeat
+
+
+def time_parallel(documents, backend, repeat, pool):
+    batch = documents * repeat
+    extract_batch(documents, backend, max_pages=0, max_chars=0, executor=pool)  # warm up the workers
+    start = time.perf_counter()
+    extract_batch(batch, backend, max_pages=0, max_chars=0, executor=pool)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pages/sec of each installed PDF text backend over a folder of resumes.")
+    parser.add_argument("--folder", default=SAMPLE_DIR)
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the folder per backend")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.folder, "*.pdf")))
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            documents.append(f.read())
+    total_pages = sum(1 for data in documents for _ in iter_pages(data, "auto", max_pages=0))
+    print(f"{len(documents)} PDFs, {total_pages} pages, {args.repeat} passes, {args.workers} workers")
+
+    print(f"{'backend':<10} {'pages/s':>9} {'parallel pages/s':>17} {'chars':>8}")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for backend in available_backends():
+            rate, chars = time_sequential(documents, backend, args.repeat)
+            parallel = total_pages * args.repeat / time_parallel(documents, backend, args.repeat, pool)
+            print(f"{backend:<10} {rate:>9.1f} {parallel:>17.1f} {chars:>8}")
+
+
+if __name__ == "__main__":
+    main()
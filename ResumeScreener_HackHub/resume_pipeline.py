@@ -0,0 +1,172 @@
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+import pdf_text
+from screening_cache import evaluation_key, text_key
+
+load_dotenv()
+
+# Bounds of the screening pipeline, overridable from .env
+MAX_CONCURRENCY = int(os.getenv("SCREENER_MAX_CONCURRENCY", "8"))
+REQUESTS_PER_MINUTE = float(os.getenv("SCREENER_REQUESTS_PER_MINUTE", "30"))
+MAX_RETRIES = int(os.getenv("SCREENER_MAX_RETRIES", "4"))
+BACKOFF_SECONDS = 2.0
+# Exception classes (by name, anywhere in the MRO) of the groq/openai SDKs and httpx that mean the
+# request never got an answer; matched by name so the pipeline does not depend on those packages
+_TRANSIENT_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "TimeoutException", "NetworkError"})
+
+
+def parse_pdf_bytes(data):
+    """Extract the text of a PDF given as bytes. Runs in a worker process, so errors are returned, not shown."""
+    try:
+        return pdf_text.extract_text(data), None
+    except Exception as e:
+        return "", f"Error reading PDF: {e}"
+
+
+class RateLimiter:
+    """Spaces calls evenly so that at most `per_minute` start in any minute."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class StageTimings:
+    """Durations of every pipeline stage, for the summary shown after a screen."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def record(self, stage, seconds):
+        self.stages.setdefault(stage, []).append(seconds)
+
+    def summary(self):
+        rows = []
+        for stage, durations in self.stages.items():
+            ordered = sorted(durations)
+            rows.append({
+                "Stage": stage,
+                "Count": len(ordered),
+                "Total (s)": round(sum(ordered), 2),
+                "Mean (s)": round(sum(ordered) / len(ordered), 2),
+                "p95 (s)": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            })
+        return rows
+
+
+def is_transient(error):
+    """Whether a failed LLM call is worth retrying: timeouts, connection errors, 429 and 5xx responses.
+
+    Anything else (auth errors, bad requests, bugs such as TypeError) would fail the same way again.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in (408, 429) or status >= 500
+    return any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+async def call_with_retries(executor, fn, *args, retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    """Run a blocking call on `executor`, retrying transient failures with exponential backoff and jitter."""
+    loop = asyncio.get_running_loop()
+    for attempt in range(retries + 1):
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            await asyncio.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+async def parse_resumes(files, parse_pool, timings, cache=None):
+    """Extract the text of every resume concurrently; returns one dict (file, text, error) per file, in order.
+
+    `files` is a list of (name, pdf bytes), parsed on `parse_pool` (a process
+    pool). With a ScreeningCache, text is looked up by the SHA-256 of the PDF
+    bytes and the extraction backend, so unchanged PDFs are never parsed twice.
+    """
+    loop = asyncio.get_running_loop()
+    extractor = pdf_text.extractor_id()
+
+    async def parse(name, data):
+        key = text_key(data, extractor) if cache is not None else None
+        text = cache.get_text(key) if cache is not None else None
+        error = None
+        if text is None:
+            start = time.perf_counter()
+            text, error = await loop.run_in_executor(parse_pool, parse_pdf_bytes, data)
+            timings.record("Parse PDF", time.perf_counter() - start)
+            if cache is not None and not error:
+                cache.put_text(key, text)
+        return {"file": name, "text": text, "error": error}
+
+    resumes = await asyncio.gather(*(parse(name, data) for name, data in files))
+    if cache is not None:
+        cache.flush()
+    return resumes
+
+
+async def evaluate_resumes(resumes, job_requirements, evaluate, timings, cache=None, model_id=None,
+                           prompt_version=None, max_concurrency=MAX_CONCURRENCY,
+                           requests_per_minute=REQUESTS_PER_MINUTE):
+    """Evaluate parsed resumes concurrently, yielding one result per resume as soon as it finishes.
+
+    `evaluate(resume_text, job_requirements)` is a blocking LLM call run on a
+    thread pool, at most `max_concurrency` at a time and rate limited to
+    `requests_per_minute`. Each result is the resume dict plus evaluation,
+    error and cached. With a ScreeningCache, evaluations are looked up by
+    (text, job, prompt version, model id) and cached ones skip the LLM.
+    """
+    limiter = RateLimiter(requests_per_minute)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def process(resume):
+        result = dict(resume, evaluation=None, cached=False)
+        text = resume["text"]
+        if cache is not None:
+            key = evaluation_key(text, job_requirements, prompt_version, model_id)
+            result["evaluation"] = cache.get_evaluation(key)
+            if result["evaluation"] is not None:
+                result["cached"] = True
+                return result
+
+        async with semaphore:
+            await limiter.acquire()
+            start = time.perf_counter()
+            try:
+                result["evaluation"] = await call_with_retries(llm_pool, evaluate, text, job_requirements)
+            except Exception as e:
+                result["error"] = f"Evaluation failed: {e}"
+            timings.record("LLM evaluation", time.perf_counter() - start)
+        if cache is not None and result["evaluation"]:
+            cache.put_evaluation(key, result["evaluation"])
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm") as llm_pool:
+        tasks = [asyncio.ensure_future(process(resume)) for resume in resumes]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            if cache is not None:
+                cache.flush()
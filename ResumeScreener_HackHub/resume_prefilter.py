@@ -0,0 +1,178 @@
+import math
+import os
+import re
+from collections import Counter
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Shortlist cutoffs, overridable from .env: keep the best TOP_K resumes (0 = no limit)
+# that cover at least MIN_COVERAGE of the job description's keywords
+TOP_K = int(os.getenv("SCREENER_SHORTLIST_TOP_K", "0"))
+MIN_COVERAGE = float(os.getenv("SCREENER_MIN_KEYWORD_COVERAGE", "0.2"))
+# Whether resumes left off the shortlist are emailed a rejection; off by default, since the
+# shortlist is a keyword heuristic and no one has read those resumes
+REJECT_NOT_SHORTLISTED = os.getenv("SCREENER_REJECT_NOT_SHORTLISTED", "false").lower() == "true"
+MAX_KEYWORDS = 40
+
+# Keeps technology names such as c++, c#, node.js and ci/cd intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its "
+    "me my of on or our so that the their there this to was we what when where "
+    "which who why will with you your".split()
+)
+# Words every job description uses that say nothing about the skills asked for
+_JOB_FILLER = frozenset(
+    "ability able candidate candidates company good great ideal including job looking "
+    "must new plus preferred position required requirements responsibilities role "
+    "skills strong team understanding using work working year years experience "
+    "knowledge familiarity excellent proficiency proficient etc also well like such qualifications".split()
+)
+# Common skills picked out of a job description even when mentioned only once
+SKILL_TERMS = frozenset("""
+python|java|javascript|typescript|c++|c#|golang|rust|kotlin|swift|scala|ruby|php|matlab|bash
+html|css|react|angular|vue|node.js|next.js|django|flask|fastapi|spring|spring boot|.net
+sql|nosql|mysql|postgresql|mongodb|redis|cassandra|elasticsearch|kafka|spark|hadoop|airflow
+aws|azure|gcp|docker|kubernetes|terraform|ansible|jenkins|ci/cd|devops|linux|git|github
+rest|graphql|microservices|agile|scrum|jira|tdd|unit testing|selenium
+machine learning|deep learning|nlp|computer vision|pytorch|tensorflow|keras|scikit-learn|pandas|numpy
+data analysis|data science|power bi|tableau|excel|statistics
+version control|problem solving|communication|leadership|teamwork
+""".replace("\n", "|").strip("|").split("|"))
+# Job description sections that describe the company or the offer rather than the candidate
+_BOILERPLATE_SECTIONS = (
+    "about", "company", "location", "benefits", "perks", "equal opportunity", "application", "how to apply", "salary",
+)
+_SECTION_RE = re.compile(r"^\s*([A-Za-z][A-Za-z &/-]{1,40}):")
+_RESUME_SECTIONS = (
+    "experience", "education", "skills", "projects", "summary", "objective",
+    "certifications", "internship", "employment", "work history", "achievements",
+)
+MIN_RESUME_CHARS = 300
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def requirement_text(job_text):
+    """Drop the company, benefits and similar boilerplate sections of a job description."""
+    kept = []
+    skipping = False
+    for line in job_text.splitlines():
+        match = _SECTION_RE.match(line)
+        if match:
+            heading = match.group(1).strip().lower()
+            skipping = heading.startswith(_BOILERPLATE_SECTIONS)
+        if not skipping:
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def extract_keywords(job_text, max_keywords=MAX_KEYWORDS):
+    """Skills named in a job description, then its most repeated other terms and phrases."""
+    tokens = tokenize(requirement_text(job_text))
+    phrases = [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    skills = list(dict.fromkeys(term for term in tokens + phrases if term in SKILL_TERMS))
+
+    content = [token for token in tokens if token not in _JOB_FILLER and not token.isdigit() and len(token) > 2]
+    counts = Counter(content)
+    counts.update(f"{first} {second}" for first, second in zip(content, content[1:]) if first != second)
+    # A term seen once is usually incidental wording rather than a requirement
+    repeated = [term for term, count in counts.most_common() if count > 1 and term not in skills]
+    return (skills + repeated)[:max_keywords]
+
+
+def resume_check(text):
+    """Heuristic for text that is not a resume: return (is_resume, reason)."""
+    if len(text.strip()) < MIN_RESUME_CHARS:
+        return False, "Too little text (scanned image or empty PDF?)"
+    lowered = text.lower()
+    sections = sum(section in lowered for section in _RESUME_SECTIONS)
+    has_contact = bool(_EMAIL_RE.search(text) or _PHONE_RE.search(text))
+    if sections < 2:
+        return False, "No resume sections such as experience, education or skills"
+    if not has_contact:
+        return False, "No email address or phone number"
+    return True, None
+
+
+def _terms(text):
+    """Single tokens plus adjacent two-word phrases, so phrase keywords can match."""
+    tokens = tokenize(text)
+    return Counter(tokens) + Counter(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+
+
+class ResumeRanker:
+    """BM25 ranking of resumes against the keywords of one job description."""
+
+    def __init__(self, texts, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [_terms(text) for text in texts]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = sum(self._lengths) / len(self._lengths) if texts else 0.0
+        doc_freqs = Counter()
+        for freqs in self._term_freqs:
+            doc_freqs.update(freqs.keys())
+        self._idf = {
+            term: math.log(1 + (len(texts) - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freqs.items()
+        }
+
+    def score(self, i, keywords):
+        term_freqs = self._term_freqs[i]
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._avg_length) if self._avg_length else self.k1
+        score = 0.0
+        for term in keywords:
+            freq = term_freqs.get(term)
+            if freq:
+                score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+        return score
+
+    def matched(self, i, keywords):
+        return [term for term in keywords if term in self._term_freqs[i]]
+
+
+def prefilter(resumes, job_text, top_k=TOP_K, min_coverage=MIN_COVERAGE):
+    """Rank resumes against the job description and pick the shortlist for LLM evaluation.
+
+    `resumes` is a list of dicts with file and text. Returns one row per resume,
+    best first, with index (position in `resumes`; file names need not be
+    unique), score, coverage (fraction of job keywords found), matched keywords,
+    is_resume, shortlisted and reason.
+    """
+    keywords = extract_keywords(job_text)
+    ranker = ResumeRanker([resume["text"] for resume in resumes])
+    rows = []
+    for i, resume in enumerate(resumes):
+        is_resume, reason = resume_check(resume["text"])
+        matched = ranker.matched(i, keywords)
+        rows.append({
+            "index": i,
+            "file": resume["file"],
+            "score": ranker.score(i, keywords),
+            "coverage": len(matched) / len(keywords) if keywords else 1.0,
+            "matched": matched,
+            "is_resume": is_resume,
+            "shortlisted": False,
+            "reason": reason,
+        })
+
+    rows.sort(key=lambda row: (-row["is_resume"], -row["score"]))
+    shortlisted = 0
+    for row in rows:
+        if not row["is_resume"]:
+            continue
+        if row["coverage"] < min_coverage:
+            row["reason"] = f"Matches {row['coverage']:.0%} of job keywords, below the {min_coverage:.0%} cutoff"
+        elif top_k and shortlisted >= top_k:
+            row["reason"] = f"Outside the top {top_k}"
+        else:
+            row["shortlisted"] = True
+            shortlisted += 1
+    return rows
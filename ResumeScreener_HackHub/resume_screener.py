@@ -1,42 +1,63 @@
 import streamlit as st
+import asyncio
 import os
 import re
-import PyPDF2
+import time
 import threading
+from concurrent.futures import ProcessPoolExecutor
 import subprocess
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 from phi.agent import Agent
 from phi.model.groq import Groq
 
+from resume_pipeline import StageTimings, evaluate_resumes, parse_resumes
+from resume_prefilter import MIN_COVERAGE, REJECT_NOT_SHORTLISTED, TOP_K, prefilter
+import pdf_text
+from screening_cache import ScreeningCache, text_key
+from notification_outbox import Outbox, OutboxSender
+
 # Load environment variables
 load_dotenv()
 
-# Initialize AI model
-model = Groq(id="llama-3.3-70b-versatile")
+MODEL_ID = "llama-3.3-70b-versatile"
+# Bump whenever the evaluation prompt changes, so cached evaluations from the old prompt are not reused
+PROMPT_VERSION = 1
+
+# Create AI Agent; one per evaluation, since evaluations run concurrently and an Agent keeps per-run state
+def create_agent():
+    return Agent(
+        model=Groq(id=MODEL_ID),
+        description="An AI agent that evaluates resumes based on job requirements, experience, and technical skills.",
+    )
+
+# PDF parsing pool, shared by every session and rerun of this Streamlit process
+@st.cache_resource
+def get_parse_pool():
+    return ProcessPoolExecutor()
 
-# Create AI Agent
-agent = Agent(
-    model=model,
-    description="An AI agent that evaluates resumes based on job requirements, experience, and technical skills.",
-)
+# On-disk cache of extracted PDF text and evaluations, shared by every session
+@st.cache_resource
+def get_cache():
+    return ScreeningCache()
 
 # Email credentials from .env
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")  # Your Gmail
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")  # App Password
 
-# Function to extract text from a PDF file
+# Persistent outbox drained by one background sender per process over a single SMTP connection
+@st.cache_resource
+def get_outbox_sender():
+    return OutboxSender(Outbox(), username=EMAIL_ADDRESS, password=EMAIL_PASSWORD).start()
+
+# Function to extract text from an uploaded PDF file, with the configured backend and page/char budget
 def extract_text_from_pdf(pdf_input):
-    text = ''
     try:
-        reader = PyPDF2.PdfReader(pdf_input)
-        for page in reader.pages:
-            text += page.extract_text() or ''
+        return pdf_text.extract_text(pdf_input.getvalue())
     except Exception as e:
         st.error(f"Error reading PDF: {e}")
-    return text
+        return ''
 
 # Function to extract email from resume text
 def extract_email(text):
@@ -71,7 +92,7 @@ def evaluate_resume(resume_text, job_requirements):
     If rejected, include constructive feedback for improvement.
     """
     
-    response = agent.run(prompt + "\n\nResume:\n" + resume_text)
+    response = create_agent().run(prompt + "\n\nResume:\n" + resume_text)
     return response.content
 
 # Function to parse AI evaluation results
@@ -103,7 +124,7 @@ def parse_evaluation(evaluation_text):
 
     return scores, recommendation, feedback
 
-# Function to send email (Accepted/Rejected)
+# Function to queue an email (Accepted/Rejected); the outbox sender delivers it in the background
 def send_email(to_email, candidate_name, decision, feedback=None):
     subject = f"Application Status - {decision}"
 
@@ -139,13 +160,12 @@ def send_email(to_email, candidate_name, decision, feedback=None):
     msg['Subject'] = subject
     msg.attach(MIMEText(message_body, 'plain'))
 
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_ADDRESS, to_email, msg.as_string())
-        print(f"✅ Email sent to {to_email} ({decision})")
-    except Exception as e:
-        print(f"❌ Failed to send email: {e}")
+    sender = get_outbox_sender()
+    if sender.outbox.enqueue(EMAIL_ADDRESS, to_email, msg.as_string(), dedupe_text=f"{subject}\n{message_body}"):
+        print(f"📨 Email queued for {to_email} ({decision})")
+        sender.wake()
+    else:
+        print(f"↩ Email to {to_email} ({decision}) was already queued")
 
 # Streamlit UI for Resume Screening
 st.title("📄 AI Resume Screener")
@@ -156,7 +176,12 @@ st.subheader("📌 Upload Job Description (PDF)")
 job_desc_uploaded = st.file_uploader("Upload Job Description", type=["pdf"])
 
 if job_desc_uploaded:
-    job_requirements_text = extract_text_from_pdf(job_desc_uploaded)
+    job_desc_key = text_key(job_desc_uploaded.getvalue(), pdf_text.extractor_id())
+    job_requirements_text = get_cache().get_text(job_desc_key)
+    if job_requirements_text is None:
+        job_requirements_text = extract_text_from_pdf(job_desc_uploaded)
+        if job_requirements_text:
+            get_cache().put_text(job_desc_key, job_requirements_text)
     st.write("### Extracted Job Description:")
     st.text(job_requirements_text)
 else:
@@ -166,41 +191,127 @@ else:
 st.subheader("📂 Upload Candidate Resumes (PDF)")
 resume_uploaded = st.file_uploader("Upload Resumes", type=["pdf"], accept_multiple_files=True)
 
-if job_desc_uploaded and resume_uploaded:
+# Shortlist cutoffs of the local pre-filter; only shortlisted resumes are sent to the LLM
+st.sidebar.subheader("Shortlist")
+shortlist_top_k = st.sidebar.number_input("Top K resumes to evaluate (0 = no limit)", min_value=0, value=TOP_K)
+min_coverage = st.sidebar.slider("Minimum job keyword coverage", 0.0, 1.0, MIN_COVERAGE, 0.05)
+reject_not_shortlisted = st.sidebar.checkbox("Email a rejection to resumes not shortlisted", value=REJECT_NOT_SHORTLISTED)
+
+# Delivery status of the notification outbox
+st.sidebar.subheader("Email outbox")
+outbox_sender = get_outbox_sender()
+outbox_counts = outbox_sender.outbox.counts()
+outbox_stats = outbox_sender.stats()
+st.sidebar.caption(f"Pending {outbox_counts['pending']}, sent {outbox_counts['sent']}, dead-lettered {outbox_counts['dead']}")
+st.sidebar.caption(f"{outbox_stats['messages_per_sec']:.1f} messages/sec, {outbox_stats['failed']} failed attempts this session")
+
+# Parse every resume, shortlist locally, then evaluate and notify the shortlist concurrently,
+# showing each result as soon as it is ready
+async def run_screening(files, job_requirements_text):
+    timings = StageTimings()
     results = []
-    for resume_file in resume_uploaded:
-        st.write(f"### Processing: {resume_file.name}")
-        
-        resume_text = extract_text_from_pdf(resume_file)
+    start = time.perf_counter()
+
+    with st.spinner("Extracting resume text..."):
+        resumes = await parse_resumes(files, get_parse_pool(), timings, cache=get_cache())
+    parsed = [resume for resume in resumes if not resume["error"]]
+    for resume in resumes:
+        if resume["error"]:
+            st.error(f"{resume['file']}: {resume['error']}")
+            results.append({"Candidate": resume["file"], "Email": None, "Job Match": None, "Experience": None,
+                            "Technical Skills": None, "Final Decision": "Error"})
+
+    prefilter_start = time.perf_counter()
+    ranking = prefilter(parsed, job_requirements_text, top_k=shortlist_top_k, min_coverage=min_coverage)
+    timings.record("Pre-filter", time.perf_counter() - prefilter_start)
+    st.subheader("🔎 Shortlist")
+    st.table([{
+        "File": row["file"],
+        "Score": round(row["score"], 2),
+        "Keyword coverage": f"{row['coverage']:.0%}",
+        "Shortlisted": "Yes" if row["shortlisted"] else "No",
+        "Reason": row["reason"] or "",
+    } for row in ranking])
+
+    # Keyed by position in `parsed`, since two uploads may share a file name
+    shortlisted = [row["index"] for row in ranking if row["shortlisted"]]
+    for row in ranking:
+        if row["shortlisted"] or not row["is_resume"]:
+            continue
+        # Real resumes below the cutoff skip the LLM; they are only rejected by email if explicitly enabled
+        resume_text = parsed[row["index"]]["text"]
         email = extract_email(resume_text)
         candidate_name = extract_name(resume_text)
+        if reject_not_shortlisted and email != "Email not found":
+            email_start = time.perf_counter()
+            send_email(email, candidate_name, "Reject")
+            timings.record("Queue email", time.perf_counter() - email_start)
+        results.append({"Candidate": candidate_name, "Email": email, "Job Match": None, "Experience": None,
+                        "Technical Skills": None, "Final Decision": "Not shortlisted"})
+    for row in ranking:
+        if not row["is_resume"]:
+            results.append({"Candidate": row["file"], "Email": None, "Job Match": None, "Experience": None,
+                            "Technical Skills": None, "Final Decision": "Not a resume"})
+
+    progress = st.progress(0.0, text="Evaluating shortlisted resumes...")
+    st.subheader("📊 Evaluation Summary")
+    table = st.empty()
+    table.table(results)
+
+    cached = 0
+    evaluated = 0
+    async for item in evaluate_resumes([parsed[i] for i in shortlisted],
+                                       job_requirements_text, evaluate_resume, timings, cache=get_cache(),
+                                       model_id=MODEL_ID, prompt_version=PROMPT_VERSION):
+        cached += item["cached"]
+        evaluated += 1
+        st.write(f"### Processed: {item['file']}")
+        if item["evaluation"] is None:
+            st.error(item["error"])
+            results.append({"Candidate": item["file"], "Email": None, "Job Match": None, "Experience": None,
+                            "Technical Skills": None, "Final Decision": "Error"})
+        else:
+            resume_text = item["text"]
+            email = extract_email(resume_text)
+            candidate_name = extract_name(resume_text)
+
+            evaluation_result = item["evaluation"]
+            st.write("#### Evaluation Result:")
+            st.text(evaluation_result)
+
+            # Extract scores, recommendation, and feedback
+            scores, recommendation, feedback = parse_evaluation(evaluation_result)
+            decision = recommendation if recommendation else "Rejected"
+
+            # Send email notification
+            if email != "Email not found":
+                email_start = time.perf_counter()
+                send_email(email, candidate_name, decision, feedback)
+                timings.record("Queue email", time.perf_counter() - email_start)
+
+            results.append({
+                "Candidate": candidate_name,
+                "Email": email,
+                "Job Match": scores["Job Match"],
+                "Experience": scores["Experience"],
+                "Technical Skills": scores["Technical Skills"],
+                "Final Decision": decision
+            })
+
+        table.table(results)
+        progress.progress(evaluated / len(shortlisted), text=f"Evaluated {evaluated}/{len(shortlisted)} shortlisted resumes")
+
+    wall_clock = time.perf_counter() - start
+    progress.empty()
+    st.subheader("⏱ Timings")
+    st.write(f"Screened {len(results)} resumes in {wall_clock:.1f}s wall-clock: {len(shortlisted)} shortlisted "
+             f"for LLM evaluation, {cached} evaluations served from cache.")
+    st.table(timings.summary())
+    st.caption(f"Cache: {get_cache().stats()}")
 
-        # Evaluate resume
-        evaluation_result = evaluate_resume(resume_text, job_requirements_text)
-        st.write("#### Evaluation Result:")
-        st.text(evaluation_result)
-
-        # Extract scores, recommendation, and feedback
-        scores, recommendation, feedback = parse_evaluation(evaluation_result)
-        decision = recommendation if recommendation else "Rejected"
-
-        # Send email notification
-        if email != "Email not found":
-            send_email(email, candidate_name, decision, feedback)
-
-        results.append({
-            "Candidate": candidate_name,
-            "Email": email,
-            "Job Match": scores["Job Match"],
-            "Experience": scores["Experience"],
-            "Technical Skills": scores["Technical Skills"],
-            "Final Decision": decision
-        })
-
-    # Display results in a table
-    if results:
-        st.subheader("📊 Evaluation Summary")
-        st.table(results)
+if job_desc_uploaded and resume_uploaded:
+    files = [(resume_file.name, resume_file.getvalue()) for resume_file in resume_uploaded]
+    asyncio.run(run_screening(files, job_requirements_text))
 
 # Function to run Face Verification
 if __name__ == "__main__":
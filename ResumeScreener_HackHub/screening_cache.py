@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("screening-cache")
+
+CACHE_PATH = os.getenv("SCREENER_CACHE_PATH", ".screening_cache/cache.sqlite3")
+MAX_BYTES = int(float(os.getenv("SCREENER_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+TEXT = "text"
+EVALUATION = "evaluation"
+
+
+def text_key(data, extractor):
+    """Key of extracted PDF text: the same bytes read by another backend or budget are a new entry."""
+    return hashlib.sha256(extractor.encode("utf-8") + b"\0" + data).hexdigest()
+
+
+def evaluation_key(resume_text, job_requirements, prompt_version, model_id):
+    """Key of an LLM evaluation: any change to the resume, job, prompt or model is a new entry."""
+    parts = (resume_text, job_requirements, str(prompt_version), model_id)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ScreeningCache:
+    """Content-addressed on-disk cache of extracted PDF text and resume evaluations.
+
+    Entries live in one SQLite table keyed by (kind, key). When the stored
+    values exceed `max_bytes`, the least recently used entries are evicted.
+    Lookups only read; their recency is written by the next put or flush().
+    SQLite errors are logged and never fail a screen: a failed read is a miss,
+    a failed write is skipped, and an unusable file disables the cache.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = {TEXT: 0, EVALUATION: 0}
+        self.misses = {TEXT: 0, EVALUATION: 0}
+        self.evicted = 0
+        self._touched = {}  # (kind, key) -> last_used not yet written
+        self._lock = threading.Lock()
+        self._db = None
+        self._size = 0
+        self._open(path)
+
+    def get_text(self, key):
+        return self._get(TEXT, key)
+
+    def put_text(self, key, text):
+        self._put(TEXT, key, text)
+
+    def get_evaluation(self, key):
+        return self._get(EVALUATION, key)
+
+    def put_evaluation(self, key, evaluation):
+        self._put(EVALUATION, key, evaluation)
+
+    def stats(self):
+        entries = 0
+        with self._lock:
+            if self._db is not None:
+                try:
+                    entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not read screening cache {self.path}: {e}")
+        return {
+            "enabled": self._db is not None,
+            "text_hits": self.hits[TEXT],
+            "text_misses": self.misses[TEXT],
+            "evaluation_hits": self.hits[EVALUATION],
+            "evaluation_misses": self.misses[EVALUATION],
+            "entries": entries,
+            "size_mb": round(self._size / 1024 / 1024, 2),
+            "evicted": self.evicted,
+        }
+
+    def flush(self):
+        """Write the recency of lookups since the last write; call once after a batch."""
+        with self._lock:
+            if self._db is None or not self._touched:
+                return
+            try:
+                self._write_touched()
+                self._db.commit()
+            except sqlite3.Error as e:
+                self._rollback()
+                logger.warning(f"Could not write screening cache {self.path}: {e}")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _open(self, path):
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(kind TEXT, key TEXT, value TEXT, size INTEGER, last_used REAL, PRIMARY KEY (kind, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            self._db.commit()
+            self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Screening cache {path} is unusable, screening without a cache: {e}")
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+            return
+        logger.info(f"opened screening cache {path} ({self._size / 1024 / 1024:.1f} MB)")
+
+    def _get(self, kind, key):
+        with self._lock:
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value FROM entries WHERE kind = ? AND key = ?", (kind, key)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not read screening cache {self.path}: {e}")
+            if row is None:
+                self.misses[kind] += 1
+                return None
+            self.hits[kind] += 1
+            self._touched[(kind, key)] = time.time()
+            return row[0]
+
+    def _put(self, kind, key, value):
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            if self._db is None:
+                return
+            saved_size, saved_evicted = self._size, self.evicted
+            try:
+                old = self._db.execute("SELECT size FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (kind, key, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (kind, key, value, size, time.time()),
+                )
+                self._size += size - (old[0] if old else 0)
+                self._touched.pop((kind, key), None)
+                # Pending recency first, so eviction does not drop entries that were just used
+                self._write_touched()
+                self._evict()
+                self._db.commit()
+            except sqlite3.Error as e:
+                self._rollback()
+                self._size, self.evicted = saved_size, saved_evicted
+                logger.warning(f"Could not write screening cache {self.path}: {e}")
+
+    def _rollback(self):
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _write_touched(self):
+        touched, self._touched = self._touched, {}
+        self._db.executemany(
+            "UPDATE entries SET last_used = ? WHERE kind = ? AND key = ?",
+            [(used, kind, key) for (kind, key), used in touched.items()],
+        )
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT kind, key, size FROM entries ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for kind, key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+                self._size -= size
+                self.evicted += 1
@@ -0,0 +1,102 @@
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from report_generator import generate_pdf_report
+
+TEXT_FIELDS = ["candidate_name", "role", "tech_result", "aptitude_result", "soft_skills_result", "culture_fit_result", "summary"]
+SCORE_FIELDS = ["tech_score", "aptitude_score", "soft_skills_score", "culture_fit_score"]
+
+
+def parse_score(value):
+    score = float(value)
+    return int(score) if score.is_integer() else score
+
+
+def load_candidates(path):
+    """Read candidate results from a .jsonl or .csv file, one candidate per line/row."""
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(file))
+        else:
+            rows = [json.loads(line) for line in file if line.strip()]
+
+    candidates = []
+    for row in rows:
+        missing = [field for field in TEXT_FIELDS + SCORE_FIELDS if row.get(field) in (None, "")]
+        if missing:
+            raise ValueError(f"Candidate {row.get('candidate_name', '?')} is missing: {', '.join(missing)}")
+        candidate = {field: str(row[field]) for field in TEXT_FIELDS}
+        candidate.update({field: parse_score(row[field]) for field in SCORE_FIELDS})
+        candidate["filename"] = row.get("filename") or None
+        candidates.append(candidate)
+    return candidates
+
+
+def report_filename(candidate, index, out_dir):
+    if candidate["filename"]:
+        return os.path.join(out_dir, candidate["filename"])
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", candidate["candidate_name"]).strip("_") or "candidate"
+    return os.path.join(out_dir, f"{index:05d}_{slug}.pdf")
+
+
+def render_one(candidate, filename):
+    """Render a single report. Runs in a worker process and returns its render time."""
+    start = time.perf_counter()
+    generate_pdf_report(
+        filename,
+        *(candidate[field] for field in TEXT_FIELDS),
+        *(candidate[field] for field in SCORE_FIELDS),
+        verbose=False,
+    )
+    return time.perf_counter() - start
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def run_batch(candidates, out_dir, workers=None):
+    os.makedirs(out_dir, exist_ok=True)
+    render_times, failures = [], []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(render_one, candidate, report_filename(candidate, i, out_dir)): candidate
+            for i, candidate in enumerate(candidates)
+        }
+        for future in as_completed(futures):
+            try:
+                render_times.append(future.result())
+            except Exception as e:
+                failures.append((futures[future]["candidate_name"], str(e)))
+    wall = time.perf_counter() - start
+    return render_times, failures, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render candidate evaluation reports in parallel.")
+    parser.add_argument("input", help="JSONL or CSV file with one candidate result per line/row")
+    parser.add_argument("--out-dir", default="reports")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    candidates = load_candidates(args.input)
+    render_times, failures, wall = run_batch(candidates, args.out_dir, args.workers)
+
+    for name, error in failures:
+        print(f"❌ Failed to render report for {name}: {error}")
+    print(f"Rendered {len(render_times)}/{len(candidates)} reports in {wall:.2f}s")
+    print(f"Throughput: {len(render_times) / wall if wall else 0.0:.1f} reports/sec")
+    print(f"Render time: p50 {percentile(render_times, 50) * 1000:.0f} ms, p95 {percentile(render_times, 95) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import ast
+import json
+import logging
+import re
+import time
+
+from perf_stats import LatencyHistogram
+
+logger = logging.getLogger("evaluation-parser")
+
+# Expected keys and their types for each kind of LLM evaluation.
+STAGE_SCHEMA = {"evaluation": str, "score": int}
+OVERALL_SCHEMA = {"overall_evaluation": str, "overall_score": int, "recommendation": str}
+STRENGTHS_SCHEMA = {"strengths": list, "improvements": list}
+
+SCORE_RANGE = (1, 10)
+MAX_RETRIES = 1
+RETRY_BUDGET = 4
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_SCORE_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+class EvaluationParseError(ValueError):
+    pass
+
+
+def _find_object(text):
+    """Return the first balanced {...} block in `text`, ignoring braces inside strings."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth, quote, escaped = 0, None, False
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def extract_json(text):
+    """Pull a JSON object out of raw LLM text (code fences, surrounding prose, single quotes)."""
+    if not isinstance(text, str):
+        raise EvaluationParseError("LLM response is not text")
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    candidate = _find_object(text)
+    if candidate is None:
+        raise EvaluationParseError("No JSON object found in LLM response")
+
+    candidate = _TRAILING_COMMA_RE.sub(r"\1", candidate)
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    try:
+        # Python-style dicts: single quotes, True/False/None
+        data = ast.literal_eval(candidate)
+    except (ValueError, SyntaxError):
+        raise EvaluationParseError("LLM response is not valid JSON")
+    if not isinstance(data, dict):
+        raise EvaluationParseError("LLM response is not a JSON object")
+    return data
+
+
+def _coerce_score(value):
+    if isinstance(value, bool):
+        raise EvaluationParseError("score must be a number")
+    if isinstance(value, str):
+        match = _SCORE_RE.search(value)
+        if not match:
+            raise EvaluationParseError(f"score is not a number: {value!r}")
+        value = float(match.group(0))
+    if not isinstance(value, (int, float)):
+        raise EvaluationParseError("score must be a number")
+    score = int(round(value))
+    if not SCORE_RANGE[0] <= score <= SCORE_RANGE[1]:
+        raise EvaluationParseError(f"score {score} is outside {SCORE_RANGE[0]}-{SCORE_RANGE[1]}")
+    return score
+
+
+def validate(data, schema):
+    """Check `data` against `schema`, coercing scores. Returns a new dict with only the schema keys."""
+    if not isinstance(data, dict):
+        raise EvaluationParseError("evaluation must be a JSON object")
+    missing = [key for key in schema if key not in data]
+    if missing:
+        raise EvaluationParseError(f"missing keys: {', '.join(missing)}")
+
+    result = {}
+    for key, expected in schema.items():
+        value = data[key]
+        if expected is int:
+            value = _coerce_score(value)
+        elif expected is str:
+            if not isinstance(value, str) or not value.strip():
+                raise EvaluationParseError(f"{key} must be a non-empty string")
+            value = value.strip()
+        elif expected is list:
+            if not isinstance(value, list):
+                raise EvaluationParseError(f"{key} must be a list")
+            value = [str(item).strip() for item in value if str(item).strip()]
+        result[key] = value
+    return result
+
+
+def parse_evaluation(text, schema):
+    return validate(extract_json(text), schema)
+
+
+class ParseMetrics:
+    """Counters for evaluation parsing, shared by every parser in the process."""
+
+    def __init__(self):
+        self.parsed = 0
+        self.repaired = 0
+        self.failed = 0
+        self.retries = 0
+        self.retry_latency = LatencyHistogram()
+
+    @property
+    def success_rate(self):
+        total = self.parsed + self.repaired + self.failed
+        return (self.parsed + self.repaired) / total if total else 1.0
+
+    def snapshot(self):
+        return {
+            "parsed": self.parsed,
+            "repaired": self.repaired,
+            "failed": self.failed,
+            "retries": self.retries,
+            "success_rate": self.success_rate,
+            "retry_latency": self.retry_latency.snapshot(),
+        }
+
+
+parse_metrics = ParseMetrics()
+
+
+class EvaluationParser:
+    """Parses LLM evaluations, asking the LLM to repair its output within a capped retry budget."""
+
+    def __init__(self, llm, max_retries=MAX_RETRIES, retry_budget=RETRY_BUDGET, metrics=parse_metrics):
+        self.llm = llm
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.metrics = metrics
+
+    async def parse(self, text, schema, name="evaluation"):
+        try:
+            result = parse_evaluation(text, schema)
+            self.metrics.parsed += 1
+            return result
+        except EvaluationParseError as e:
+            error = e
+
+        for _ in range(self.max_retries):
+            if self.retry_budget <= 0:
+                logger.warning(f"Retry budget exhausted, not repairing {name}")
+                break
+            self.retry_budget -= 1
+            self.metrics.retries += 1
+            logger.warning(f"Repairing {name} after parse error: {error}")
+
+            start = time.perf_counter()
+            text = await self.llm.generate(self._repair_prompt(text, schema, error))
+            self.metrics.retry_latency.observe(time.perf_counter() - start)
+            try:
+                result = parse_evaluation(text, schema)
+                self.metrics.repaired += 1
+                return result
+            except EvaluationParseError as e:
+                error = e
+
+        self.metrics.failed += 1
+        raise EvaluationParseError(f"Could not parse {name}: {error}")
+
+    @staticmethod
+    def _repair_prompt(text, schema, error):
+        keys = ", ".join(f'"{key}" ({expected.__name__})' for key, expected in schema.items())
+        return f"""
+        The following response should have been a JSON object with the keys {keys}.
+        Scores must be whole numbers from {SCORE_RANGE[0]} to {SCORE_RANGE[1]}.
+        It could not be used because: {error}
+
+        Response:
+        {text}
+
+        Return ONLY the corrected JSON object, with no other text.
+        """
@@ -1,10 +1,16 @@
+import hashlib
 import os
+import re
+import time
+from collections import deque
+
 import cv2
 import streamlit as st
 import numpy as np
-from deepface import DeepFace
 from datetime import datetime
-import time
+
+from face_index import DISTANCE_THRESHOLD, FaceIndex, LiveFace, warm_up
+from face_search import IdentityIndex
 
 # Streamlit UI Setup
 st.set_page_config(page_title="Face Verification System", layout="centered")
@@ -54,13 +60,23 @@ if 'verified' not in st.session_state:
     st.session_state.verified = False
 if 'verification_in_progress' not in st.session_state:
     st.session_state.verification_in_progress = False
+if 'live_image' not in st.session_state:
+    st.session_state.live_image = None
+if 'live_face' not in st.session_state:
+    st.session_state.live_face = None
+
+# Set FACE_AUDIT_DIR to keep a JPEG copy of every verification attempt; captures otherwise never touch disk
+AUDIT_DIR = os.getenv("FACE_AUDIT_DIR")
+
+# Function to decode the camera bytes once into a BGR ndarray
+def decode_image(buffer):
+    return cv2.imdecode(np.frombuffer(buffer, dtype=np.uint8), cv2.IMREAD_COLOR)
 
 # Function to preprocess image to improve face detection
-def preprocess_image(image_path):
+def preprocess_image(img):
     try:
-        img = cv2.imread(image_path)
         if img is None:
-            return False
+            return None
             
         # Resize to reasonable dimensions
         img = cv2.resize(img, (640, 480))
@@ -71,12 +87,28 @@ def preprocess_image(image_path):
         lab[:,:,0] = clahe.apply(lab[:,:,0])
         img = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
         
-        # Save the preprocessed image
-        cv2.imwrite(image_path, img)
-        return True
+        return img
     except Exception as e:
         st.error(f"Error preprocessing image: {e}")
-        return False
+        return None
+
+# Audit file name for an applicant: typed names may contain path separators or "..", so keep only
+# safe characters, plus a short hash so different names that sanitize alike never share files
+def audit_name(applicant_name):
+    safe = re.sub(r"[^A-Za-z0-9_-]+", "_", applicant_name).strip("_") or "applicant"
+    return f"{safe}-{hashlib.sha1(applicant_name.encode('utf-8')).hexdigest()[:8]}"
+
+# Function to store a JPEG audit copy of a capture, only when FACE_AUDIT_DIR is set
+def save_audit_copy(img, applicant_name, verified):
+    if not AUDIT_DIR:
+        return
+    os.makedirs(AUDIT_DIR, exist_ok=True)
+    ok, jpeg = cv2.imencode(".jpg", img)
+    if ok:
+        status = "verified" if verified else "rejected"
+        filename = f"{audit_name(applicant_name)}_{datetime.now():%Y%m%d_%H%M%S_%f}_{status}.jpg"
+        with open(os.path.join(AUDIT_DIR, filename), "wb") as f:
+            f.write(jpeg.tobytes())
 
 # Function to reset verification
 def reset_verification():
@@ -84,70 +116,94 @@ def reset_verification():
     st.session_state.image_captured = False
     st.session_state.verified = False
     st.session_state.verification_in_progress = False
-    if os.path.exists("temp_live_capture.jpg"):
-        os.remove("temp_live_capture.jpg")
-
-# Function to verify face with optimized performance
-def verify_face(image_path, applicant_folder):
-    # Use only the most reliable backends and models to improve speed
-    backends = ['retinaface', 'opencv']  # Limited to just 2 backends
-    models = ['Facenet512']  # Using just the best model for speed
-    
-    # First check if a face is detectable
-    face_detected = False
-    for backend in backends:
-        try:
-            DeepFace.detectFace(
-                img_path=image_path, 
-                target_size=(224, 224), 
-                detector_backend=backend
-            )
-            face_detected = True
-            break
-        except Exception:
-            continue
-    
-    if not face_detected:
+    st.session_state.live_image = None
+    st.session_state.live_face = None
+
+# Models are loaded and warmed once per server process, then shared by every session and rerun
+@st.cache_resource(show_spinner="Loading face models...")
+def load_face_models():
+    model_load_time = warm_up()
+    # Reference embeddings are computed once per profile and reused across attempts
+    latencies = {stage: deque(maxlen=500) for stage in ("verification", "detection", "embedding")}
+    return FaceIndex(), model_load_time, latencies
+
+face_index, model_load_time, latencies = load_face_models()
+
+# One embedding matrix over every enrolled applicant for 1:N search, rebuilt when any profile's
+# images are added, replaced or removed (the cache key is the signature of every profile folder)
+@st.cache_resource(show_spinner="Indexing enrolled applicants...", max_entries=1)
+def load_identity_index(signature):
+    return IdentityIndex.from_face_index(face_index)
+
+def latency_summary(stage):
+    samples = sorted(latencies[stage])
+    if not samples:
+        return "no samples yet"
+    p50 = samples[len(samples) // 2]
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"{len(samples)} samples, p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms"
+
+st.sidebar.caption(f"Face models loaded in {model_load_time:.1f}s")
+st.sidebar.caption(f"Verification latency: {latency_summary('verification')}")
+st.sidebar.caption(f"Detector latency: {latency_summary('detection')}")
+st.sidebar.caption(f"Embedding latency: {latency_summary('embedding')}")
+
+# Function to verify face against the applicant's indexed reference embeddings
+def verify_face(live_face, applicant_name):
+    profile = face_index.get(applicant_name)
+
+    # Detection and embedding run once per capture; retries reuse the cached crop and embedding
+    fresh = live_face.detector_time is None
+    live_embedding = live_face.embedding
+    if fresh:
+        latencies["detection"].append(live_face.detector_time)
+        if live_face.embedding_time is not None:
+            latencies["embedding"].append(live_face.embedding_time)
+    if live_embedding is None:
         return False, "No face detected. Please try again with better lighting."
-    
-    # Proceed with verification if face was detected
-    best_distance = 1.0
-    verification_success = False
-    
-    # Check against stored images with timeout to prevent hanging
-    start_time = time.time()
-    timeout = 5  # Maximum seconds to spend on verification
-    
-    for file in os.listdir(applicant_folder):
-        # Check if we've spent too much time already
-        if time.time() - start_time > timeout:
-            break
-            
-        if file.endswith(('.jpg', '.jpeg', '.png')):
-            stored_image_path = os.path.join(applicant_folder, file)
-            
-            try:
-                result = DeepFace.verify(
-                    img1_path=image_path,
-                    img2_path=stored_image_path,
-                    model_name=models[0],
-                    distance_metric='cosine',
-                    detector_backend=backends[0]
-                )
-                
-                if result["verified"] and result["distance"] < best_distance:
-                    best_distance = result["distance"]
-                    
-                if best_distance < 0.55:  # Original threshold
-                    verification_success = True
-                    break
-                    
-            except Exception:
-                continue
-    
+
+    best_distance, _ = profile.best_match(live_embedding)
+    verification_success = best_distance is not None and best_distance <= DISTANCE_THRESHOLD
     return verification_success, best_distance if verification_success else None
 
+# Function to identify a live capture among all enrolled applicants, without a typed name
+def identify_candidate():
+    identity_index = load_identity_index(face_index.signature())
+    st.info("Position your face clearly in the center of the frame.")
+    camera_input = st.camera_input("Take a picture to identify the candidate", key="identify_camera")
+    if camera_input is None:
+        return
+
+    live_image = preprocess_image(decode_image(camera_input.getbuffer()))
+    if live_image is None:
+        return
+
+    with st.spinner("Searching enrolled applicants..."):
+        live_face = LiveFace(live_image)
+        live_embedding = live_face.embedding
+        start_time = time.perf_counter()
+        matches = identity_index.identify(live_embedding) if live_embedding is not None else []
+        search_latency = time.perf_counter() - start_time
+
+    if live_embedding is None:
+        st.warning("⚠️ No face detected. Please try again with better lighting.")
+        return
+    if not matches:
+        st.error("❌ This face does not match any enrolled applicant.")
+    elif len(matches) == 1:
+        st.success(f"✅ Identified as {matches[0][0]}.")
+    else:
+        names = ", ".join(name for name, _ in matches)
+        st.warning(f"⚠️ This face matches several applicants ({names}). Possible impersonation.")
+    search_type = "approximate" if identity_index.approximate else "exact"
+    st.caption(f"Searched {len(identity_index.names)} applicants ({search_type}) in {search_latency * 1000:.1f} ms")
+
 # Main app flow
+mode = st.radio("Mode", ["Verify applicant", "Identify candidate"], horizontal=True)
+if mode == "Identify candidate":
+    identify_candidate()
+    st.stop()
+
 applicant_name = st.text_input("Enter applicant name:", placeholder="Type name and press Enter...").strip()
 
 if applicant_name:
@@ -167,21 +223,21 @@ if applicant_name:
             camera_input = st.camera_input("Take a picture for verification", key="camera")
             
             if camera_input is not None:
-                # Save the captured image
-                with open("temp_live_capture.jpg", "wb") as f:
-                    f.write(camera_input.getbuffer())
-                
-                # Preprocess the image to improve face detection
-                if preprocess_image("temp_live_capture.jpg"):
+                # Decode and preprocess the capture in memory; it lives only in this session's state
+                live_image = preprocess_image(decode_image(camera_input.getbuffer()))
+                if live_image is not None:
+                    st.session_state.live_image = live_image
+                    st.session_state.live_face = LiveFace(live_image)
                     st.session_state.image_captured = True
                     st.rerun()  # Rerun to update the UI
         
         # Verification process
         if st.session_state.image_captured and not st.session_state.verification_in_progress:
-            st.image("temp_live_capture.jpg", caption="Captured Image", use_container_width=True)
+            live_image = st.session_state.live_image
+            if live_image is not None:
+                st.image(live_image, caption="Captured Image", channels="BGR", use_container_width=True)
             
             if st.session_state.verification_attempts < 3 and not st.session_state.verified:
-                image_path = "temp_live_capture.jpg"
                 st.session_state.verification_in_progress = True
                 
                 # Use the global spinner with a maximum wait time
@@ -189,7 +245,16 @@ if applicant_name:
                     # Create a background message for longer verifications
                     status_msg = status_placeholder.info("Comparing with stored images...")
                     
-                    verification_success, message = verify_face(image_path, APPLICANT_FOLDER)
+                    start_time = time.perf_counter()
+                    verification_success, message = verify_face(st.session_state.live_face, applicant_name)
+                    verification_latency = time.perf_counter() - start_time
+                    latencies["verification"].append(verification_latency)
+                    live_face = st.session_state.live_face
+                    timings = f"detector {live_face.detector_time * 1000:.0f} ms ({live_face.backend or 'no face'})"
+                    if live_face.embedding_time is not None:
+                        timings += f", embedding {live_face.embedding_time * 1000:.0f} ms"
+                    st.caption(f"Verification took {verification_latency * 1000:.0f} ms: {timings}")
+                    save_audit_copy(live_image, applicant_name, verification_success)
                     
                     # Clear the status message
                     status_placeholder.empty()
@@ -197,6 +262,11 @@ if applicant_name:
                     if verification_success:
                         st.session_state.verified = True
                         status_placeholder.success(f"✅ Face Verified! Welcome, {applicant_name}.")
+                        # The same face enrolled under other names means one person is interviewing for several applicants
+                        identity_index = load_identity_index(face_index.signature())
+                        other_matches = [name for name, _ in identity_index.identify(live_face.embedding) if name != applicant_name]
+                        if other_matches:
+                            st.warning(f"⚠️ This face also matches other applicants: {', '.join(other_matches)}. Please review before the interview.")
                         # Display the interview prompt
                         st.success("You can move to the interview next.")
                     else:
@@ -228,6 +298,7 @@ if applicant_name:
                     st.experimental_set_query_params()
                     st.rerun()
 
-        # Remove the captured image if it exists
-        if os.path.exists("temp_live_capture.jpg") and st.session_state.verification_attempts >= 3:
-            os.remove("temp_live_capture.jpg")
+        # Drop the captured image once no attempts are left
+        if st.session_state.verification_attempts >= 3:
+            st.session_state.live_image = None
+            st.session_state.live_face = None
@@ -0,0 +1,236 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PROFILE_ROOT = "APPLICANT_PROFILE"
+INDEX_ROOT = ".face_index"
+MODEL_NAME = "Facenet512"
+DETECTOR_BACKENDS = ["retinaface", "opencv"]
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# DeepFace's own cosine threshold for Facenet512, which DeepFace.verify applied before
+DISTANCE_THRESHOLD = 0.30
+# Bumped whenever the embedding pipeline changes, so stale indexes are rebuilt
+INDEX_VERSION = 2
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def detect_face(img, backends=DETECTOR_BACKENDS):
+    """Detect and align the most prominent face in `img` (a path or BGR ndarray).
+
+    Later backends are tried only when an earlier one finds no face. Returns
+    (aligned BGR uint8 crop, backend), or (None, None) if no backend finds a face.
+    """
+    # DeepFace pulls in TensorFlow, so it is only imported by the functions that run the models;
+    # normalize and the index classes stay importable without it (e.g. by face_search_bench.py)
+    from deepface import DeepFace
+
+    for backend in backends:
+        try:
+            faces = DeepFace.extract_faces(img_path=img, detector_backend=backend, align=True)
+        except ValueError:
+            continue  # no face found by this backend
+        face = max(faces, key=lambda f: f["facial_area"]["w"] * f["facial_area"]["h"])
+        # extract_faces returns RGB in [0, 1]; represent expects a BGR image
+        crop = np.clip(face["face"][:, :, ::-1] * 255, 0, 255).astype(np.uint8)
+        return crop, backend
+    return None, None
+
+
+def embed_crop(crop):
+    """Embed an already detected and aligned face crop without running a detector again."""
+    from deepface import DeepFace
+
+    faces = DeepFace.represent(img_path=crop, model_name=MODEL_NAME, detector_backend="skip")
+    return normalize(faces[0]["embedding"])
+
+
+def embed_image(img, backends=DETECTOR_BACKENDS):
+    """Embed the most prominent face in `img`, or return None if no face is found."""
+    crop, _ = detect_face(img, backends)
+    return None if crop is None else embed_crop(crop)
+
+
+class LiveFace:
+    """A live capture whose face is detected, aligned and embedded at most once.
+
+    The aligned crop and embedding are cached, so retries and reruns on the same
+    capture reuse them. Detector and embedding times are kept separately.
+    """
+
+    def __init__(self, image, backends=DETECTOR_BACKENDS):
+        self.image = image
+        self.backends = backends
+        self.crop = None
+        self.backend = None
+        self.detector_time = None
+        self.embedding_time = None
+        self._detected = False
+        self._embedding = None
+
+    def detect(self):
+        if not self._detected:
+            start = time.perf_counter()
+            self.crop, self.backend = detect_face(self.image, self.backends)
+            self.detector_time = time.perf_counter() - start
+            self._detected = True
+        return self.crop
+
+    @property
+    def embedding(self):
+        if self._embedding is None and self.detect() is not None:
+            start = time.perf_counter()
+            self._embedding = embed_crop(self.crop)
+            self.embedding_time = time.perf_counter() - start
+        return self._embedding
+
+
+def warm_up(backends=DETECTOR_BACKENDS):
+    """Build the recognition model and every detector backend, and run one dummy inference through each.
+
+    Returns the elapsed seconds, i.e. the model load time the first real verification no longer pays.
+    """
+    from deepface import DeepFace
+
+    start = time.perf_counter()
+    dummy = np.zeros((224, 224, 3), dtype=np.uint8)
+    for backend in backends:
+        DeepFace.extract_faces(img_path=dummy, detector_backend=backend, enforce_detection=False)
+    embed_crop(dummy)
+    return time.perf_counter() - start
+
+
+def profile_images(folder):
+    return sorted(file for file in os.listdir(folder) if file.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def profile_signature(folder):
+    """File names, sizes and mtimes of a profile's reference images, used to detect stale indexes."""
+    signature = []
+    for file in profile_images(folder):
+        stat = os.stat(os.path.join(folder, file))
+        signature.append([file, stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+class ProfileEmbeddings:
+    """Unit-normalized reference embeddings of one applicant, memory-mapped from disk."""
+
+    def __init__(self, name, embeddings, metadata):
+        self.name = name
+        self.embeddings = embeddings
+        self.metadata = metadata
+
+    @property
+    def files(self):
+        return self.metadata["files"]
+
+    def distances(self, embedding):
+        """Cosine distances of a normalized live embedding to every reference, in one matrix product."""
+        return 1.0 - self.embeddings @ embedding
+
+    def best_match(self, embedding):
+        """Return (distance, reference file) of the closest reference, or (None, None) if there are none."""
+        if not len(self.embeddings):
+            return None, None
+        distances = self.distances(embedding)
+        best = int(np.argmin(distances))
+        return float(distances[best]), self.files[best]
+
+
+class FaceIndex:
+    """Per-applicant embedding index stored under `index_root/<name>/`.
+
+    Each profile is stored as `embeddings.npy` (float32, one normalized row per
+    reference image) and `meta.json` (model, reference files and the folder
+    signature). A profile is re-embedded only when its folder changes.
+    """
+
+    def __init__(self, profile_root=PROFILE_ROOT, index_root=INDEX_ROOT):
+        self.profile_root = profile_root
+        self.index_root = index_root
+        self._loaded = {}
+
+    def profile_folder(self, name):
+        return os.path.join(self.profile_root, name)
+
+    def names(self):
+        return sorted(
+            entry for entry in os.listdir(self.profile_root)
+            if os.path.isdir(os.path.join(self.profile_root, entry))
+        )
+
+    def signature(self):
+        """Hashable signature of every profile folder; changes when any applicant's images change."""
+        return tuple(
+            (name, tuple(tuple(entry) for entry in profile_signature(self.profile_folder(name))))
+            for name in self.names()
+        )
+
+    def get(self, name):
+        """Return the profile's embeddings, building or refreshing the index if the folder changed."""
+        folder = self.profile_folder(name)
+        signature = profile_signature(folder)
+        profile = self._loaded.get(name)
+        if profile is None or profile.metadata["signature"] != signature:
+            profile = self._load(name)
+            if profile is None or profile.metadata["signature"] != signature:
+                profile = self.build(name)
+            self._loaded[name] = profile
+        return profile
+
+    def build(self, name):
+        folder = self.profile_folder(name)
+        signature = profile_signature(folder)
+        files, skipped, rows = [], [], []
+        for file, _, _ in signature:
+            embedding = embed_image(os.path.join(folder, file))
+            if embedding is None:
+                skipped.append(file)
+                continue
+            files.append(file)
+            rows.append(embedding)
+
+        embeddings = np.vstack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+        metadata = {
+            "name": name,
+            "version": INDEX_VERSION,
+            "model": MODEL_NAME,
+            "dim": int(embeddings.shape[1]) if rows else 0,
+            "files": files,
+            "skipped": skipped,
+            "signature": signature,
+        }
+        directory = os.path.join(self.index_root, name)
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "embeddings.npy"), embeddings)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump(metadata, file, indent=2)
+        return self._load(name)
+
+    def _load(self, name):
+        directory = os.path.join(self.index_root, name)
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as file:
+                metadata = json.load(file)
+            embeddings = np.load(os.path.join(directory, "embeddings.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if metadata.get("version") != INDEX_VERSION or metadata.get("model") != MODEL_NAME:
+            return None
+        return ProfileEmbeddings(name, embeddings, metadata)
+
+
+if __name__ == "__main__":
+    # Enroll profiles ahead of time: python face_index.py [name ...]
+    index = FaceIndex()
+    for name in sys.argv[1:] or index.names():
+        profile = index.build(name)
+        print(f"{name}: {len(profile.files)} references indexed, {len(profile.metadata['skipped'])} without a face")
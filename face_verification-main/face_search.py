@@ -0,0 +1,119 @@
+import numpy as np
+
+from face_index import DISTANCE_THRESHOLD
+
+# Above this many enrolled identities, 1:N search switches from exact to the approximate IVF index
+APPROXIMATE_ABOVE = 20000
+
+
+def top_k(scores, k):
+    """Indices of the `k` highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class ExactSearch:
+    """Brute-force cosine search: one matrix-vector product over every reference embedding."""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def search(self, query, k):
+        """Return (row indices, cosine similarities) of the `k` nearest rows, best first."""
+        scores = self.matrix @ query
+        top = top_k(scores, k)
+        return top, scores[top]
+
+
+class IVFSearch:
+    """Inverted-file index: rows are clustered with spherical k-means and only the
+    `n_probe` clusters closest to the query are scanned.
+
+    Pure NumPy, so it needs no extra dependency; recall is traded for latency
+    through `n_probe`.
+    """
+
+    def __init__(self, matrix, n_lists=None, n_probe=16, iterations=8, seed=0):
+        n = len(matrix)
+        self.n_lists = min(n, n_lists or max(1, int(4 * np.sqrt(n))))
+        self.n_probe = min(n_probe, self.n_lists)
+        rng = np.random.default_rng(seed)
+        centroids = matrix[rng.choice(n, self.n_lists, replace=False)].astype(np.float32)
+        for _ in range(iterations):
+            assignment = np.argmax(matrix @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            starts = np.searchsorted(assignment[order], np.arange(self.n_lists))
+            filled = np.bincount(assignment, minlength=self.n_lists) > 0
+            sums = np.add.reduceat(matrix[order], starts[filled], axis=0)
+            centroids[filled] = sums / np.linalg.norm(sums, axis=1, keepdims=True)
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+
+        # Rows stored contiguously per cluster so a probe scans one slice
+        self.centroids = centroids
+        self.row_ids = np.argsort(assignment, kind="stable")
+        self.rows = np.ascontiguousarray(matrix[self.row_ids])
+        self.offsets = np.searchsorted(assignment[self.row_ids], np.arange(self.n_lists + 1))
+
+    def search(self, query, k):
+        probes = top_k(self.centroids @ query, self.n_probe)
+        ids, scores = [], []
+        for cluster in probes:
+            start, end = self.offsets[cluster], self.offsets[cluster + 1]
+            ids.append(self.row_ids[start:end])
+            scores.append(self.rows[start:end] @ query)
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+        top = top_k(scores, k)
+        return ids[top], scores[top]
+
+
+class IdentityIndex:
+    """Every enrolled identity's reference embeddings stacked into one matrix for 1:N identification.
+
+    `labels[i]` is the identity of matrix row i. Exact search is used up to
+    `approximate_above` identities, IVFSearch beyond that.
+    """
+
+    def __init__(self, matrix, labels, names, files=None, approximate_above=APPROXIMATE_ABOVE):
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.labels = np.asarray(labels)
+        self.names = list(names)
+        self.files = files
+        self.approximate = len(self.names) > approximate_above
+        self.search_index = IVFSearch(self.matrix) if self.approximate else ExactSearch(self.matrix)
+        self.max_refs = int(np.bincount(self.labels).max()) if len(self.labels) else 0
+
+    @classmethod
+    def from_face_index(cls, face_index, approximate_above=APPROXIMATE_ABOVE):
+        names, rows, labels, files = [], [], [], []
+        for name in face_index.names():
+            profile = face_index.get(name)
+            if not len(profile.embeddings):
+                continue
+            labels.extend([len(names)] * len(profile.embeddings))
+            files.extend(profile.files)
+            rows.append(profile.embeddings)
+            names.append(name)
+        matrix = np.vstack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+        return cls(matrix, labels, names, files, approximate_above)
+
+    def identify(self, embedding, k=5, threshold=DISTANCE_THRESHOLD):
+        """Return up to `k` (name, distance) matches within `threshold`, one per identity, closest first."""
+        if not len(self.matrix):
+            return []
+        rows, scores = self.search_index.search(embedding, k * self.max_refs)
+        matches = []
+        seen = set()
+        for row, score in zip(rows, scores):
+            label = self.labels[row]
+            distance = 1.0 - float(score)
+            if label in seen or distance > threshold:
+                continue
+            seen.add(label)
+            matches.append((self.names[label], distance))
+            if len(matches) == k:
+                break
+        return matches
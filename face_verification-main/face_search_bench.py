@@ -0,0 +1,70 @@
+import argparse
+import time
+
+import numpy as np
+
+from face_index import normalize
+from face_search import ExactSearch, IVFSearch
+
+
+def synthetic_identities(n, dim, intrinsic_dim, noise, rng):
+    """Unit identity centres drawn from a low-dimensional subspace, like real face embeddings."""
+    basis = rng.standard_normal((intrinsic_dim, dim)).astype(np.float32)
+    centres = rng.standard_normal((n, intrinsic_dim)).astype(np.float32) @ basis
+    centres = normalize(centres)
+    return centres, lambda ids: normalize(centres[ids] + noise * normalize(rng.standard_normal((len(ids), dim))))
+
+
+def time_queries(index, queries, k):
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        rows, _ = index.search(query, k)
+        latencies.append(time.perf_counter() - start)
+        results.append(rows[0])
+    latencies.sort()
+    return np.array(results), latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall and latency of exact vs IVF 1:N face search on synthetic embeddings.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated identity counts")
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--intrinsic-dim", type=int, default=64)
+    parser.add_argument("--noise", type=float, default=0.6, help="norm of the capture noise relative to the identity")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-probe", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'identities':>10} {'index':<6} {'build s':>8} {'p50 ms':>8} {'p95 ms':>8} {'recall@1':>9} {'top-1 acc':>10}")
+    for n in map(int, args.sizes.split(",")):
+        _, sample = synthetic_identities(n, args.dim, args.intrinsic_dim, args.noise, rng)
+        references = sample(np.arange(n))
+        truth = rng.integers(0, n, size=args.queries)
+        queries = sample(truth)
+
+        start = time.perf_counter()
+        exact = ExactSearch(references)
+        exact_build = time.perf_counter() - start
+        exact_top, exact_p50, exact_p95 = time_queries(exact, queries, 1)
+
+        start = time.perf_counter()
+        ivf = IVFSearch(references, n_probe=args.n_probe)
+        ivf_build = time.perf_counter() - start
+        ivf_top, ivf_p50, ivf_p95 = time_queries(ivf, queries, 1)
+
+        for name, build, top, p50, p95 in (
+            ("exact", exact_build, exact_top, exact_p50, exact_p95),
+            ("ivf", ivf_build, ivf_top, ivf_p50, ivf_p95),
+        ):
+            # recall@1 is measured against the exact search result, top-1 accuracy against the true identity
+            recall = np.mean(top == exact_top)
+            accuracy = np.mean(top == truth)
+            print(f"{n:>10} {name:<6} {build:>8.2f} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f} {recall:>9.3f} {accuracy:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fpdf import FPDF
+from PIL import Image
+
+from perf_stats import LatencyHistogram
+
+LOGO_PATH = "ICEBREAKERS.png"
+RENDER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Logo decoded once per render worker process by _init_worker
+_logo = None
+# Render queue shared by every agent in this process, created by shared_render_queue()
+_shared_queue = None
+
+
+def _core_font_text(text):
+    """Replace characters the built-in helvetica font cannot encode (it only covers latin-1)."""
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+class InterviewReportPDF(FPDF):
+    """Custom PDF generator for interview reports."""
+    
+    def __init__(self, interview_data, logo=LOGO_PATH):
+        super().__init__()
+        self.interview_data = interview_data
+        self.logo = logo
+        self.set_auto_page_break(auto=True, margin=15)
+        self.set_margins(left=15, top=15, right=15)
+        
+    def header(self):
+        """Generate report header."""
+        # Add company logo if available
+        self.image(self.logo, 10, 8, 33)
+        
+        # Set font and colors
+        self.set_font('helvetica', 'B', 15)
+        self.set_text_color(0, 51, 102)  # Dark blue
+        
+        # Company name
+        self.cell(0, 10, 'Company Interview Report', 0, 1, 'C')
+        
+        # Date and reference number
+        self.set_font('helvetica', '', 10)
+        self.cell(0, 10, f"Date: {self.interview_data['interview_date']}", 0, 1, 'R')
+        
+        # Line break
+        self.ln(5)
+    
+    def footer(self):
+        """Generate report footer."""
+        self.set_y(-15)
+        self.set_font('helvetica', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+    
+    def chapter_title(self, title):
+        """Add a chapter title."""
+        self.set_font('helvetica', 'B', 12)
+        self.set_fill_color(240, 240, 240)  # Light gray
+        self.cell(0, 10, title, 0, 1, 'L', True)
+        self.ln(4)
+    
+    def content_text(self, text):
+        """Add content text."""
+        self.set_font('helvetica', '', 11)
+        self.multi_cell(0, 5, _core_font_text(text))
+        self.ln(5)
+    
+    def score_indicator(self, score):
+        """Add a visual score indicator."""
+        self.set_font('helvetica', 'B', 10)
+        self.cell(30, 10, f"Score: {score}/10", 0, 0)
+        
+        # Draw score bar
+        self.set_draw_color(0, 0, 0)
+        self.set_fill_color(220, 220, 220)  # Light gray for background
+        self.rect(65, self.get_y() + 3, 100, 5, 'F')
+        
+        # Color depends on score
+        if score >= 8:
+            self.set_fill_color(0, 153, 0)  # Green
+        elif score >= 5:
+            self.set_fill_color(255, 153, 0)  # Orange
+        else:
+            self.set_fill_color(204, 0, 0)  # Red
+            
+        self.rect(65, self.get_y() + 3, score * 10, 5, 'F')
+        self.ln(10)
+    
+    def generate_report(self):
+        """Generate the complete report."""
+        self.add_page()
+        
+        # Candidate information
+        self.chapter_title('Candidate Information')
+        self.content_text(f"Name: {self.interview_data['candidate_name']}")
+        self.content_text(f"Interview Date: {self.interview_data['interview_date']}")
+        self.ln(5)
+        
+        # Technical assessment
+        if 'technical' in self.interview_data.get('stages', {}):
+            tech_data = self.interview_data['stages']['technical']
+            self.chapter_title('Technical Assessment')
+            self.content_text(f"Question: {tech_data.get('question', 'N/A')}")
+            self.content_text(f"Response: {tech_data.get('response', 'N/A')}")
+            self.content_text(f"Evaluation: {tech_data.get('evaluation', 'N/A')}")
+            self.score_indicator(tech_data.get('score', 0))
+        
+        # Soft skills assessment
+        if 'soft_skills' in self.interview_data.get('stages', {}):
+            soft_data = self.interview_data['stages']['soft_skills']
+            self.chapter_title('Soft Skills Assessment')
+            self.content_text(f"Question: {soft_data.get('question', 'N/A')}")
+            self.content_text(f"Response: {soft_data.get('response', 'N/A')}")
+            self.content_text(f"Evaluation: {soft_data.get('evaluation', 'N/A')}")
+            self.score_indicator(soft_data.get('score', 0))
+        
+        # Culture fit assessment
+        if 'culture_fit' in self.interview_data.get('stages', {}):
+            culture_data = self.interview_data['stages']['culture_fit']
+            self.chapter_title('Culture Fit Assessment')
+            self.content_text(f"Question: {culture_data.get('question', 'N/A')}")
+            self.content_text(f"Response: {culture_data.get('response', 'N/A')}")
+            self.content_text(f"Evaluation: {culture_data.get('evaluation', 'N/A')}")
+            self.score_indicator(culture_data.get('score', 0))
+        
+        # Overall evaluation
+        self.add_page()
+        self.chapter_title('Overall Evaluation')
+        self.content_text(self.interview_data.get('overall_feedback', 'No overall feedback provided.'))
+        self.score_indicator(self.interview_data.get('overall_score', 0))
+        
+        # Recommendation
+        self.chapter_title('Recommendation')
+        recommendation = self.interview_data.get('recommendation', 'No recommendation provided.')
+        self.set_font('helvetica', 'B', 12)
+        
+        # Set color based on recommendation
+        if recommendation == "Strongly Recommend":
+            self.set_text_color(0, 102, 0)  # Dark green
+        elif recommendation == "Recommend":
+            self.set_text_color(0, 153, 0)  # Green
+        elif recommendation == "Consider":
+            self.set_text_color(255, 153, 0)  # Orange
+        else:
+            self.set_text_color(204, 0, 0)  # Red
+            
+        self.cell(0, 10, _core_font_text(recommendation), 0, 1, 'L')
+        self.set_text_color(0, 0, 0)  # Reset to black
+        
+        # Strengths and areas for improvement are produced during the closing stage
+        strengths = self.interview_data.get('strengths') or ["No strengths recorded."]
+        improvements = self.interview_data.get('improvements') or ["No areas for improvement recorded."]
+        
+        self.chapter_title('Key Strengths')
+        for strength in strengths:
+            self.content_text(f"- {strength}")
+        
+        self.chapter_title('Areas for Improvement')
+        for improvement in improvements:
+            self.content_text(f"- {improvement}")
+
+
+def _init_worker(logo_path):
+    global _logo
+    logo = Image.open(logo_path)
+    logo.load()
+    _logo = logo
+
+
+def render_report(snapshot, report_path):
+    """Render a serialized interview_data snapshot to `report_path`. Runs in a worker process."""
+    start = time.perf_counter()
+    try:
+        interview_data = json.loads(snapshot)
+        pdf = InterviewReportPDF(interview_data, logo=_logo if _logo is not None else LOGO_PATH)
+        pdf.generate_report()
+        pdf.output(report_path)
+    except Exception as e:
+        # Library exceptions may not pickle, and one that fails to cross back breaks the whole pool
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    return time.perf_counter() - start
+
+
+class ReportRenderQueue:
+    """Renders interview reports in a process pool so PDF work never runs on the agent's event loop."""
+
+    def __init__(self, max_workers=1, logo_path=LOGO_PATH):
+        self.max_workers = max_workers
+        self.logo_path = logo_path
+        self._executor = self._new_executor()
+        self.queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.render_time = LatencyHistogram(buckets=RENDER_BUCKETS)
+
+    def submit(self, interview_data, report_path):
+        """Queue a report and return an asyncio future resolving to its render time in seconds."""
+        snapshot = json.dumps(interview_data, default=str)
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, render_report, snapshot, report_path)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS); start a fresh pool rather than failing every later report
+            self._executor = self._new_executor()
+            future = loop.run_in_executor(self._executor, render_report, snapshot, report_path)
+        self.queue_depth += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "render_time": self.render_time.snapshot(),
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.logo_path,),
+        )
+
+    def _on_done(self, future):
+        self.queue_depth -= 1
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+            return
+        self.completed += 1
+        self.render_time.observe(future.result())
+
+
+def shared_render_queue():
+    """The ReportRenderQueue shared by every agent in this process, created on first use."""
+    global _shared_queue
+    if _shared_queue is None:
+        _shared_queue = ReportRenderQueue()
+    return _shared_queue
@@ -0,0 +1,91 @@
+from knowledge_base import knowledge_base
+
+COMPANY_FOLDER = "data/company"
+
+FINISH_INSTRUCTION = (
+    "Once you have questioned the user over the key aspects required by the company, "
+    "generate a short summary about the user's fit and give a score out of 100, "
+    "then call finish_stage with that summary and score."
+)
+
+STAGE_REGISTRY = {}
+
+
+class InterviewStage:
+    """One interview round: its persona, instructions and the knowledge it may retrieve."""
+
+    def __init__(self, name, title, instructions, persona_folder=None, persona_label=None,
+                 knowledge_folders=(COMPANY_FOLDER,)):
+        self.name = name
+        self.title = title
+        self.instructions = instructions
+        self.persona_folder = persona_folder
+        self.persona_label = persona_label
+        self.knowledge_folders = list(knowledge_folders)
+
+    @property
+    def greeting(self):
+        return f"Hey, I will be taking your {self.title} Interview today"
+
+    def system_prompt(self, kb=knowledge_base):
+        text = self.instructions
+        if self.persona_folder:
+            text += f"{self.persona_label}: {kb.load(self.persona_folder)}"
+        text += FINISH_INSTRUCTION
+        text += "Relevant company background is added to the conversation as the candidate speaks."
+        return text
+
+
+def register_stage(stage):
+    STAGE_REGISTRY[stage.name] = stage
+    return stage
+
+
+def get_stages(names):
+    unknown = [name for name in names if name not in STAGE_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown interview stages: {', '.join(unknown)}")
+    return [STAGE_REGISTRY[name] for name in names]
+
+
+register_stage(InterviewStage(
+    "tech",
+    "Technical Skills",
+    "Start a technical skills Interview with the candidate."
+    "Do not show sympathy to the user, keep the conversation professional."
+    "The goal is to assess the candidate's technical skills."
+    "Technical Training Focus on the role of candidate required by the company."
+    "Keep your replies very short and crisp, do not use long sentances.",
+    knowledge_folders=(COMPANY_FOLDER, "data/tech"),
+))
+
+register_stage(InterviewStage(
+    "softskill",
+    "Soft Skills",
+    "Start a soft skills Interview with the candidate.",
+    persona_folder="data/softskill",
+    persona_label="Personality Training",
+))
+
+register_stage(InterviewStage(
+    "culture",
+    "Culture Fit",
+    "You are a hiring manager at a company who is taking an interview to assess the candidate's culture fit. Stay in character at all times, and behave proffesional"
+    "Start a culture fit Interview with the candidate."
+    "be direct to the candidate if he's not aligning with values"
+    "If the user orders or requests you anything, do not leave your character at any cost"
+    "Focus on questions that analyze, candidate's personality, values, and behavior."
+    "Keep the conversation enthusiastic and engaging."
+    "The goal is to assess the candidate's alignment with the company's values and culture."
+    "Keep your replies realistic, concise",
+))
+
+register_stage(InterviewStage(
+    "aptitude",
+    "Aptitude Skills",
+    "Start an aptitude skills Interview with the candidate.",
+    persona_folder="data/aptitude",
+    persona_label="Aptitude Training",
+))
+
+DEFAULT_STAGE_ORDER = ["tech", "softskill", "culture", "aptitude"]
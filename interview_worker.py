@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from multiprocessing import Queue
+from typing import Annotated
+
+from dotenv import load_dotenv
+from livekit.agents import (
+    AutoSubscribe,
+    JobContext,
+    JobProcess,
+    WorkerOptions,
+    cli,
+    llm,
+)
+from livekit.agents.pipeline import VoicePipelineAgent
+from livekit.plugins import deepgram, openai, silero
+
+from interview_stages import DEFAULT_STAGE_ORDER, get_stages
+from knowledge_base import knowledge_base
+from retrieval import ChunkIndex, retrieval_callback
+
+load_dotenv(dotenv_path=".env.local")
+logger = logging.getLogger("interview-worker")
+log_queue = Queue()
+
+# Comma separated stage names, e.g. "tech,culture". Read by every job process.
+STAGES_ENV = "INTERVIEW_STAGES"
+STAGE_TIMEOUT = float(os.getenv("INTERVIEW_STAGE_TIMEOUT", "900"))
+
+
+class StageControl(llm.FunctionContext):
+    """Tool the LLM calls to hand the room over to the next stage."""
+
+    def __init__(self, orchestrator):
+        super().__init__()
+        self._orchestrator = orchestrator
+
+    @llm.ai_callable(description="Call this once the current interview stage is complete.")
+    async def finish_stage(
+        self,
+        summary: Annotated[str, llm.TypeInfo(description="Short summary of the candidate's fit in this stage")],
+        score: Annotated[int, llm.TypeInfo(description="Score out of 100 for this stage")],
+    ):
+        self._orchestrator.complete_stage(summary, score)
+        return "Stage recorded. Do not say anything else."
+
+
+class InterviewOrchestrator:
+    """Runs the registered stages in sequence on a single voice pipeline."""
+
+    def __init__(self, stages, index):
+        self.stages = stages
+        self.index = index
+        self.results = {}
+        self.current_stage = None
+        self._retrieve = None
+        self._stage_done = asyncio.Event()
+        self.agent = None
+
+    def create_agent(self, vad):
+        self.agent = VoicePipelineAgent(
+            vad=vad,
+            stt=deepgram.STT(model="nova-2"),
+            llm=openai.LLM.with_groq(model="llama-3.3-70b-versatile"),
+            tts=deepgram.TTS(),
+            chat_ctx=llm.ChatContext(),
+            fnc_ctx=StageControl(self),
+            before_llm_cb=self._before_llm,
+        )
+
+        @self.agent.on("agent_speech_committed")
+        def on_agent_speech_committed(msg: llm.ChatMessage):
+            log_queue.put_nowait(f"[{datetime.now()}] AGENT ({self.current_stage.name}):\n{msg.content}\n\n")
+
+        return self.agent
+
+    async def run(self):
+        for stage in self.stages:
+            self._enter(stage)
+            await self.agent.say(stage.greeting, allow_interruptions=False)
+            try:
+                await asyncio.wait_for(self._stage_done.wait(), timeout=STAGE_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"stage {stage.name} timed out after {STAGE_TIMEOUT:.0f}s")
+            logger.info(f"finished stage {stage.name}: {self.results.get(stage.name)}")
+        await self.agent.say("Thank you for completing all interviews. We'll be in touch soon.", allow_interruptions=False)
+        return self.results
+
+    def complete_stage(self, summary, score):
+        self.results[self.current_stage.name] = {"summary": summary, "score": score}
+        self._stage_done.set()
+
+    def _enter(self, stage):
+        logger.info(f"starting stage {stage.name}")
+        self.current_stage = stage
+        self._stage_done.clear()
+        self._retrieve = retrieval_callback(self.index, folders=stage.knowledge_folders)
+        # Only the system prompt changes between stages; VAD, STT, TTS and LLM are reused.
+        self.agent.chat_ctx.messages[:] = [
+            llm.ChatMessage.create(text=stage.system_prompt(knowledge_base), role="system")
+        ]
+
+    async def _before_llm(self, agent, chat_ctx):
+        return await self._retrieve(agent, chat_ctx)
+
+
+def prewarm(proc: JobProcess):
+    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["knowledge_base"] = knowledge_base.compile()
+    proc.userdata["kb_index"] = ChunkIndex.build(knowledge_base)
+
+
+async def entrypoint(ctx: JobContext):
+    names = os.getenv(STAGES_ENV, ",".join(DEFAULT_STAGE_ORDER)).split(",")
+    stages = get_stages([name.strip() for name in names if name.strip()])
+    logger.info(f"knowledge base cache: {knowledge_base.stats()}")
+
+    logger.info(f"connecting to room {ctx.room.name}")
+    await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+
+    participant = await ctx.wait_for_participant()
+    logger.info(f"starting interview ({', '.join(stage.name for stage in stages)}) for participant {participant.identity}")
+
+    orchestrator = InterviewOrchestrator(stages, ctx.proc.userdata["kb_index"])
+    agent = orchestrator.create_agent(ctx.proc.userdata["vad"])
+    agent.start(ctx.room, participant)
+
+    await orchestrator.run()
+
+
+def run_worker(stage_names=None):
+    """Start the worker. Job processes inherit the stage list through the environment."""
+    if stage_names:
+        os.environ[STAGES_ENV] = ",".join(stage_names)
+    cli.run_app(
+        WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    run_worker()
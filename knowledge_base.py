@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+
+import markdown
+
+logger = logging.getLogger("knowledge-base")
+
+DATA_ROOT = "data"
+
+
+class KnowledgeBase:
+    """In-process cache of the rendered Markdown files under the data folder.
+
+    Rendered text is kept per folder and is only rebuilt when a file in that
+    folder is added, removed or modified (detected through its mtime).
+    """
+
+    def __init__(self, root=DATA_ROOT):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self._files = {}    # path -> (mtime_ns, source, html)
+        self._folders = {}  # folder -> (signature, html)
+        self._lock = threading.Lock()
+
+    def compile(self):
+        """Render every Markdown file under the root folder. Called from prewarm."""
+        folders = []
+        for dirpath, _, filenames in os.walk(self.root):
+            if any(name.endswith(".md") for name in filenames):
+                folders.append(dirpath)
+        for folder in sorted(folders):
+            self.load(folder)
+        logger.info(f"compiled knowledge base: {len(self._files)} files in {len(folders)} folders")
+        return self
+
+    def load(self, folder):
+        """Return the rendered HTML of every Markdown file in `folder`."""
+        signature = self._signature(folder)
+        with self._lock:
+            cached = self._folders.get(folder)
+            if cached is not None and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+
+            self.misses += 1
+            html = "".join(self._render(path, mtime) for path, mtime in signature)
+            # Forget files that were removed from the folder, so documents() stops returning them
+            present = {path for path, _ in signature}
+            for path in [path for path in self._files if os.path.dirname(path) == os.path.normpath(folder)]:
+                if path not in present:
+                    del self._files[path]
+            self._folders[folder] = (signature, html)
+            return html
+
+    def refresh(self):
+        """Reload every folder loaded so far that changed on disk; returns the signature of all of them."""
+        with self._lock:
+            folders = sorted(self._folders)
+        for folder in folders:
+            self.load(folder)
+        with self._lock:
+            return tuple((folder, self._folders[folder][0]) for folder in folders)
+
+    def documents(self, folder=None):
+        """Yield (path, markdown source) for every cached file, optionally limited to one folder."""
+        with self._lock:
+            items = sorted(self._files.items())
+        for path, (_, source, _) in items:
+            if folder is None or os.path.dirname(path) == os.path.normpath(folder):
+                yield path, source
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "files": len(self._files),
+            "folders": len(self._folders),
+        }
+
+    def _signature(self, folder):
+        if not os.path.isdir(folder):
+            logger.warning(f"Knowledge base folder {folder} not found")
+            return ()
+        signature = []
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".md"):
+                path = os.path.normpath(os.path.join(folder, filename))
+                signature.append((path, os.stat(path).st_mtime_ns))
+        return tuple(signature)
+
+    def _render(self, path, mtime):
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[2]
+        with open(path, "r", encoding="utf-8") as file:
+            source = file.read()
+        html = markdown.markdown(source)
+        self._files[path] = (mtime, source, html)
+        return html
+
+
+knowledge_base = KnowledgeBase()
+
+
+def load_company_info(data_folder):
+    return knowledge_base.load(data_folder)
@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("llm-cache")
+
+MAX_ENTRIES = 512
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """Lowercase, drop punctuation and collapse whitespace so trivially different prompts share a key."""
+    prompt = _PUNCTUATION_RE.sub(" ", prompt.lower())
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+class LLMResponseCache:
+    """LRU cache of LLM responses keyed on (model id, normalized prompt), optionally backed by SQLite.
+
+    Hits are served from memory; their recency is written to SQLite in batches
+    by the next put() or flush(). SQLite errors are logged and never fail a call.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._touched = {}  # key -> last_used not yet written to SQLite
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._open(path)
+
+    @staticmethod
+    def key(prompt, model):
+        return hashlib.sha256(f"{model}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    def get(self, prompt, model):
+        key = self.key(prompt, model)
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if self._db is not None:
+                self._touched[key] = time.time()
+            return response
+
+    def put(self, prompt, model, response):
+        key = self.key(prompt, model)
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            if self._db is None:
+                return
+            for k in evicted:
+                self._touched.pop(k, None)
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, last_used) VALUES (?, ?, ?, ?)",
+                    (key, model, response, time.time()),
+                )
+                self._db.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in evicted])
+                self._write_touched()
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write LLM response cache {self.path}: {e}")
+
+    def flush(self):
+        """Write the recency of cache hits since the last write to SQLite."""
+        with self._lock:
+            if self._db is None or not self._touched:
+                return
+            try:
+                self._write_touched()
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write LLM response cache {self.path}: {e}")
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _write_touched(self):
+        # Clear first: a failed write only loses recency, and should not be retried on every later call
+        touched, self._touched = self._touched, {}
+        self._db.executemany(
+            "UPDATE responses SET last_used = ? WHERE key = ?", [(used, key) for key, used in touched.items()]
+        )
+
+    def _open(self, path):
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, model TEXT, response TEXT, last_used REAL)"
+            )
+            rows = self._db.execute(
+                "SELECT key, response FROM responses ORDER BY last_used DESC LIMIT ?", (self.max_entries,)
+            ).fetchall()
+            for key, response in reversed(rows):
+                self._entries[key] = response
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"LLM response cache {path} is unusable, caching in memory only: {e}")
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+            return
+        logger.info(f"loaded {len(self._entries)} cached LLM responses from {path}")
+
+
+async def cached_generate(llm, prompt, model, cache=None, use_cache=True):
+    """Return a cached response for `prompt` if there is one, otherwise call the LLM and cache the result."""
+    if cache is None or not use_cache:
+        return await llm.generate(prompt)
+    response = cache.get(prompt, model)
+    if response is None:
+        response = await llm.generate(prompt)
+        if response and response.strip():
+            # put() commits to SQLite, so keep it off the event loop
+            await asyncio.to_thread(cache.put, prompt, model, response)
+    return response
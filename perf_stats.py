@@ -0,0 +1,48 @@
+import bisect
+import threading
+from collections import deque
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram (seconds) with fixed buckets and recent-sample percentiles."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_samples=10000):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self._samples.append(seconds)
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, max(0, round(q / 100 * len(samples)) - 1))
+        return samples[index]
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.buckets, self.bucket_counts)}
+            buckets["le_inf"] = self.bucket_counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": buckets,
+        }
@@ -0,0 +1,168 @@
+import cv2
+import dlib
+
+from proctoring_geometry import (
+    LEFT_EYE,
+    RIGHT_EYE,
+    LandmarkBuffer,
+    camera_matrix,
+    eye_aspect_ratios,
+    head_pose,
+    roll_angles,
+)
+
+
+def is_suspicious(eye_aspect_ratio, threshold=0.2):
+    return eye_aspect_ratio < threshold
+
+def is_face_within_view(face, frame_width, frame_height):
+    x, y, w, h = face.left(), face.top(), face.width(), face.height()
+    return x > 0 and y > 0 and (x + w) < frame_width and (y + h) < frame_height
+
+
+class DetectionScheduler:
+    """Runs the HOG detector on a downscaled frame only every `every_n` frames.
+
+    In between, each face box is followed with a dlib correlation tracker. A
+    tracker whose peak-to-sidelobe ratio falls below `min_confidence` forces a
+    fresh detection on the same frame. With no face in view the detector runs
+    on every frame, so a returning candidate is picked up immediately.
+
+    Downscaling never takes the short side of the frame below `min_side`
+    pixels, since the HOG detector misses faces smaller than about 80px.
+    """
+
+    def __init__(self, detector, every_n=10, scale=0.5, min_confidence=7.0, min_side=320):
+        self.detector = detector
+        self.every_n = every_n
+        self.scale = scale
+        self.min_side = min_side
+        self.min_confidence = min_confidence
+        self.frame_index = 0
+        self.detections = 0
+        self._trackers = []
+
+    def faces(self, gray):
+        faces = None
+        if self._trackers and self.frame_index % self.every_n:
+            faces = self._track(gray)
+        if faces is None:
+            faces = self._detect(gray)
+        self.frame_index += 1
+        return faces
+
+    def _track(self, gray):
+        faces = []
+        for tracker in self._trackers:
+            # PSR is NaN on a featureless frame, which must also count as lost
+            if not tracker.update(gray) >= self.min_confidence:
+                return None
+            position = tracker.get_position()
+            faces.append(dlib.rectangle(
+                int(position.left()), int(position.top()), int(position.right()), int(position.bottom())
+            ))
+        return faces
+
+    def _detect(self, gray):
+        self.detections += 1
+        scale = min(1.0, max(self.scale, self.min_side / min(gray.shape[:2])))
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            small = gray
+        faces = [
+            dlib.rectangle(
+                int(face.left() / scale), int(face.top() / scale),
+                int(face.right() / scale), int(face.bottom() / scale),
+            )
+            for face in self.detector(small)
+        ]
+        self._trackers = []
+        for face in faces:
+            tracker = dlib.correlation_tracker()
+            tracker.start_track(gray, face)
+            self._trackers.append(tracker)
+        return faces
+
+
+class FrameAnalyzer:
+    """Runs face detection and landmark analysis on a frame without drawing on it.
+
+    A dlib frontal face detector is not safe to share between threads, so every
+    analyzer owns one. The shape predictor is read-only and can be shared.
+    With `detect_every` > 1 the detector is scheduled by a DetectionScheduler
+    and faces are tracked between detections; 1 detects on every full frame.
+    """
+
+    def __init__(self, predictor, detect_every=1, detect_scale=0.5):
+        self.detector = dlib.get_frontal_face_detector()
+        self.predictor = predictor
+        self.landmarks = LandmarkBuffer()
+        self._camera = None
+        self.scheduler = None
+        if detect_every > 1:
+            self.scheduler = DetectionScheduler(self.detector, every_n=detect_every, scale=detect_scale)
+
+    def detect(self, gray):
+        if self.scheduler is not None:
+            return self.scheduler.faces(gray)
+        return self.detector(gray)
+
+    def analyze(self, frame):
+        return self.analyze_gray(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+
+    def analyze_gray(self, gray):
+        """Analyze an already greyscale frame, e.g. the luma plane of a decoded video frame."""
+        frame_height, frame_width = gray.shape[:2]
+        if self._camera is None or self._camera[0] != (frame_width, frame_height):
+            self._camera = ((frame_width, frame_height), camera_matrix(frame_width, frame_height))
+
+        detections = list(self.detect(gray))
+        landmarks = self.landmarks.fill([self.predictor(gray, face) for face in detections])
+
+        # Geometry for every face in one vectorized pass
+        ears = eye_aspect_ratios(landmarks).mean(axis=-1)
+        angles = roll_angles(landmarks)
+
+        faces = []
+        for i, face in enumerate(detections):
+            pose = head_pose(landmarks[i], self._camera[1])
+            faces.append({
+                "box": (face.left(), face.top(), face.right(), face.bottom()),
+                # Copies, since the landmark buffer is reused on the next frame
+                "left_eye": landmarks[i, LEFT_EYE].copy(),
+                "right_eye": landmarks[i, RIGHT_EYE].copy(),
+                "ear": float(ears[i]),
+                "suspicious": bool(is_suspicious(ears[i])),
+                "angle": float(angles[i]),
+                "head_pose": pose,
+                "within_view": bool(is_face_within_view(face, frame_width, frame_height)),
+            })
+
+        return {
+            "faces": faces,
+            "face_detected": bool(faces),
+            "alert": not faces or any(not face["within_view"] for face in faces),
+        }
+
+
+def draw_overlay(frame, result):
+    """Draw the proctoring warnings for `result` onto `frame`."""
+    for face in result["faces"]:
+        if face["suspicious"]:
+            cv2.putText(frame, "Suspicious activity detected!", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+        cv2.polylines(frame, [face["left_eye"]], True, (0, 255, 0), 1)
+        cv2.polylines(frame, [face["right_eye"]], True, (0, 255, 0), 1)
+
+        cv2.putText(frame, f"Face angle: {face['angle']:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        if face["head_pose"] is not None:
+            yaw, pitch, roll = face["head_pose"]
+            cv2.putText(frame, f"Yaw: {yaw:.0f} Pitch: {pitch:.0f} Roll: {roll:.0f}", (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+        if not face["within_view"]:
+            cv2.putText(frame, "Please stay within the camera view!", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+    if not result["face_detected"]:
+        cv2.putText(frame, "No face detected! Please stay in front of the camera.", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+    return frame
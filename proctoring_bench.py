@@ -0,0 +1,64 @@
+import argparse
+import time
+
+import cv2
+import dlib
+
+from proctoring_analysis import FrameAnalyzer
+
+
+def load_frames(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"Could not read any frames from {path}")
+    return frames
+
+
+def run(analyzer, frames):
+    faces = 0
+    start = time.perf_counter()
+    for frame in frames:
+        faces += analyzer.analyze(frame)["face_detected"]
+    return time.perf_counter() - start, faces
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streams-per-core for full detection vs scheduled detection with tracking.")
+    parser.add_argument("video", help="recorded interview video")
+    parser.add_argument("--predictor", default="shape_predictor_68_face_landmarks.dat")
+    parser.add_argument("--max-frames", type=int, default=900)
+    parser.add_argument("--target-fps", type=float, default=15.0, help="frame rate each stream must sustain")
+    parser.add_argument("--detect-every", type=int, default=10)
+    parser.add_argument("--detect-scale", type=float, default=0.5)
+    args = parser.parse_args()
+
+    # Decoding is excluded from the timings; both runs see the same frames
+    frames = load_frames(args.video, args.max_frames)
+    predictor = dlib.shape_predictor(args.predictor)
+    print(f"{len(frames)} frames at {frames[0].shape[1]}x{frames[0].shape[0]}, target {args.target_fps:g} fps per stream")
+
+    runs = [
+        ("detect every frame", FrameAnalyzer(predictor)),
+        (
+            f"detect every {args.detect_every} @ {args.detect_scale:g}x + tracking",
+            FrameAnalyzer(predictor, detect_every=args.detect_every, detect_scale=args.detect_scale),
+        ),
+    ]
+    print(f"{'mode':<40} {'ms/frame':>9} {'fps':>8} {'streams/core':>13} {'face frames':>12}")
+    for name, analyzer in runs:
+        elapsed, faces = run(analyzer, frames)
+        fps = len(frames) / elapsed
+        print(f"{name:<40} {elapsed / len(frames) * 1000:>9.2f} {fps:>8.1f} {fps / args.target_fps:>13.1f} {faces:>12}")
+        if analyzer.scheduler is not None:
+            print(f"{'':<40} detector ran on {analyzer.scheduler.detections}/{len(frames)} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from itertools import chain
+from operator import attrgetter
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 68
+LEFT_EYE = slice(36, 42)
+RIGHT_EYE = slice(42, 48)
+
+# Landmark indices of both eyes, shape (2, 6), and the point pairs of the EAR formula
+_EYES = np.array([range(36, 42), range(42, 48)])
+_EAR_FROM = [1, 2, 0]
+_EAR_TO = [5, 4, 3]
+
+# Generic 3D face model (arbitrary units) for head pose: nose tip, chin, outer eye corners, mouth corners
+_POSE_LANDMARKS = [30, 8, 36, 45, 48, 54]
+_POSE_MODEL = np.array([
+    (0.0, 0.0, 0.0),
+    (0.0, -330.0, -65.0),
+    (-225.0, 170.0, -135.0),
+    (225.0, 170.0, -135.0),
+    (-150.0, -150.0, -125.0),
+    (150.0, -150.0, -125.0),
+])
+_DIST_COEFFS = np.zeros((4, 1))
+
+_point_xy = attrgetter("x", "y")
+
+
+class LandmarkBuffer:
+    """Preallocated (max_faces, 68, 2) landmark array reused across frames."""
+
+    def __init__(self, max_faces=4):
+        self.array = np.empty((max_faces, NUM_LANDMARKS, 2), dtype=np.int32)
+
+    def fill(self, shapes):
+        """Copy dlib shapes into the buffer and return a view of the filled rows."""
+        if len(shapes) > len(self.array):
+            self.array = np.empty((len(shapes), NUM_LANDMARKS, 2), dtype=np.int32)
+        for i, shape in enumerate(shapes):
+            shape_to_array(shape, self.array[i])
+        return self.array[:len(shapes)]
+
+
+def shape_to_array(shape, out=None):
+    """Convert a dlib full_object_detection into a (68, 2) int32 array.
+
+    dlib exposes no buffer for its points, so the coordinates are streamed
+    through C-level iterators (map/attrgetter/chain) into np.fromiter rather
+    than built as a Python list of lists.
+    """
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 2), dtype=np.int32)
+    coords = chain.from_iterable(map(_point_xy, shape.parts()))
+    out.reshape(-1)[:] = np.fromiter(coords, dtype=np.int32, count=2 * NUM_LANDMARKS)
+    return out
+
+
+def eye_aspect_ratios(landmarks):
+    """EAR of both eyes for every face in one pass: (..., 68, 2) -> (..., 2) as (left, right)."""
+    eyes = landmarks[..., _EYES, :].astype(np.float64)
+    distances = np.linalg.norm(eyes[..., _EAR_FROM, :] - eyes[..., _EAR_TO, :], axis=-1)
+    return (distances[..., 0] + distances[..., 1]) / (2.0 * distances[..., 2])
+
+
+def roll_angles(landmarks):
+    """2D roll angle in degrees of the line between the eye centres: (..., 68, 2) -> (...)."""
+    left_center = landmarks[..., LEFT_EYE, :].mean(axis=-2)
+    right_center = landmarks[..., RIGHT_EYE, :].mean(axis=-2)
+    delta = right_center - left_center
+    return np.degrees(np.arctan2(delta[..., 1], delta[..., 0]))
+
+
+def camera_matrix(frame_width, frame_height):
+    """Pinhole camera approximation with the focal length set to the frame width."""
+    return np.array([
+        [frame_width, 0, frame_width / 2],
+        [0, frame_width, frame_height / 2],
+        [0, 0, 1],
+    ], dtype=np.float64)
+
+
+def head_pose(landmarks, camera):
+    """Return (yaw, pitch, roll) in degrees for one face's (68, 2) landmarks, or None if solvePnP fails."""
+    image_points = landmarks[_POSE_LANDMARKS].astype(np.float64)
+    ok, rotation, _ = cv2.solvePnP(_POSE_MODEL, image_points, camera, _DIST_COEFFS, flags=cv2.SOLVEPNP_ITERATIVE)
+    if not ok:
+        return None
+    matrix, _ = cv2.Rodrigues(rotation)
+    pitch, yaw, roll = cv2.RQDecomp3x3(matrix)[0]
+    # The model faces the camera, so a frontal face decomposes to a pitch of +-180
+    if pitch > 90:
+        pitch -= 180
+    elif pitch < -90:
+        pitch += 180
+    return float(yaw), float(pitch), float(roll)
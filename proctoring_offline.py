@@ -0,0 +1,175 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import dlib
+
+from proctoring_analysis import FrameAnalyzer
+
+YAW_LIMIT = 30.0
+PITCH_LIMIT = 25.0
+ROLL_LIMIT = 20.0
+
+# Shape predictor loaded once per worker process by _init_worker
+_predictor = None
+
+
+def _init_worker(predictor_path):
+    global _predictor
+    _predictor = dlib.shape_predictor(predictor_path)
+
+
+def frame_events(result):
+    """Reduce an analysis result to a compact timeline record (without video/frame/time)."""
+    faces = result["faces"]
+    events = []
+    if not faces:
+        events.append("no_face")
+    record = {"faces": len(faces), "events": events}
+    if faces:
+        face = faces[0]
+        if any(not f["within_view"] for f in faces):
+            events.append("out_of_view")
+        if face["suspicious"]:
+            events.append("low_ear")
+        record["ear"] = round(face["ear"], 3)
+        record["roll"] = round(face["angle"], 1)
+        if face["head_pose"] is not None:
+            yaw, pitch, roll = face["head_pose"]
+            record["yaw"], record["pitch"] = round(yaw, 1), round(pitch, 1)
+            if abs(yaw) > YAW_LIMIT or abs(pitch) > PITCH_LIMIT or abs(roll) > ROLL_LIMIT:
+                events.append("head_angle")
+    return record
+
+
+def video_segments(path, segment_seconds):
+    """Split a video into (start_frame, end_frame) ranges so long files spread across workers."""
+    cap = cv2.VideoCapture(path)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    if frame_count <= 0:
+        return fps, [(0, None)]
+    step = max(1, int(segment_seconds * fps))
+    return fps, [(start, min(start + step, frame_count)) for start in range(0, frame_count, step)]
+
+
+def analyze_segment(path, start, end, fps, stride, detect_every, part_path):
+    """Decode and analyze frames [start, end) of a video, writing JSONL records to `part_path`."""
+    cap = cv2.VideoCapture(path)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    analyzer = FrameAnalyzer(_predictor, detect_every=detect_every)
+    video = os.path.basename(path)
+    frames = 0
+    index = start
+    with open(part_path, "w", encoding="utf-8") as out:
+        while end is None or index < end:
+            # Phase is anchored to the video, so sampled frames do not depend on the segment length
+            if index % stride:
+                if not cap.grab():
+                    break
+                index += 1
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            record = {"video": video, "frame": index, "t": round(index / fps, 3)}
+            record.update(frame_events(analyzer.analyze(frame)))
+            out.write(json.dumps(record) + "\n")
+            frames += 1
+            index += 1
+    cap.release()
+    return frames
+
+
+def timeline_stem(path):
+    """Output file stem for a video: its name plus a short hash of its path, so same-named videos never collide."""
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return f"{os.path.splitext(os.path.basename(path))[0]}-{digest}"
+
+
+def merge_parts(parts, out_path, fmt):
+    """Concatenate segment part files (already in frame order) into one timeline file."""
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        records = []
+        for part in parts:
+            with open(part, "r", encoding="utf-8") as file:
+                records.extend(json.loads(line) for line in file)
+        pq.write_table(pa.Table.from_pylist(records), out_path)
+    else:
+        with open(out_path, "w", encoding="utf-8") as out:
+            for part in parts:
+                with open(part, "r", encoding="utf-8") as file:
+                    out.write(file.read())
+    for part in parts:
+        os.remove(part)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless proctoring analysis of recorded interview videos.")
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--predictor", default="shape_predictor_68_face_landmarks.dat")
+    parser.add_argument("--out-dir", default="timelines")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--segment-seconds", type=float, default=300.0, help="video length handled by one job")
+    parser.add_argument("--stride", type=int, default=1, help="analyze every Nth frame")
+    parser.add_argument("--detect-every", type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.predictor):
+        raise FileNotFoundError(f"Shape predictor file not found: {args.predictor}")
+    os.makedirs(args.out_dir, exist_ok=True)
+    videos = list(dict.fromkeys(args.videos))
+
+    start = time.perf_counter()
+    total_frames = 0
+    parts = {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.predictor,)) as executor:
+        futures = {}
+        for path in videos:
+            stem = timeline_stem(path)
+            fps, segments = video_segments(path, args.segment_seconds)
+            parts[path] = []
+            for i, (seg_start, seg_end) in enumerate(segments):
+                part_path = os.path.join(args.out_dir, f"{stem}.part{i:05d}.jsonl")
+                parts[path].append(part_path)
+                future = executor.submit(
+                    analyze_segment, path, seg_start, seg_end, fps, args.stride, args.detect_every, part_path
+                )
+                futures[future] = (path, i)
+        failed = set()
+        for future in as_completed(futures):
+            path, i = futures[future]
+            try:
+                total_frames += future.result()
+            except Exception as e:
+                # One bad segment only costs its own video's timeline
+                print(f"Failed to analyze {path} segment {i}: {e}")
+                failed.add(path)
+
+    for path, video_parts in parts.items():
+        if path in failed:
+            for part in video_parts:
+                if os.path.exists(part):
+                    os.remove(part)
+            print(f"No timeline written for {path}")
+            continue
+        out_path = os.path.join(args.out_dir, f"{timeline_stem(path)}.{args.format}")
+        merge_parts(video_parts, out_path, args.format)
+        print(f"Timeline for {path} written to {out_path}")
+
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {total_frames} frames from {len(videos) - len(failed)} videos in {elapsed:.1f}s ({total_frames / elapsed:.1f} frames/sec)")
+
+
+if __name__ == "__main__":
+    main()
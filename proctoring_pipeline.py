@@ -0,0 +1,202 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from perf_stats import LatencyHistogram
+from proctoring_analysis import FrameAnalyzer
+
+logger = logging.getLogger("proctoring-pipeline")
+
+
+class FrameRingBuffer:
+    """Bounded buffer that drops the oldest item instead of blocking the producer."""
+
+    def __init__(self, capacity):
+        self._items = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the oldest item, or None once the buffer is closed or the timeout expires."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout=timeout):
+                return None
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        with self._cond:
+            return self._closed and not self._items
+
+
+class PipelineStats:
+    """Live counters for the proctoring pipeline."""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.captured = 0
+        self.processed = 0
+        self.latency = LatencyHistogram()
+        self._processed_at = deque()
+        self._lock = threading.Lock()
+
+    def frame_processed(self, captured_at):
+        now = time.perf_counter()
+        self.latency.observe(now - captured_at)
+        with self._lock:
+            self.processed += 1
+            self._processed_at.append(now)
+            while self._processed_at and now - self._processed_at[0] > self.window:
+                self._processed_at.popleft()
+
+    @property
+    def fps(self):
+        with self._lock:
+            return len(self._processed_at) / self.window
+
+
+class AlertDispatcher:
+    """Plays alerts on its own thread so detection never waits on the sound.
+
+    An alert fires once the alert condition has held for `debounce_frames`
+    consecutive results, and at most once every `cooldown` seconds.
+    """
+
+    def __init__(self, play, cooldown=3.0, debounce_frames=5):
+        self.play = play
+        self.cooldown = cooldown
+        self.debounce_frames = debounce_frames
+        self.fired = 0
+        self.suppressed = 0
+        self._streak = 0
+        self._last_fired = float("-inf")
+        self._pending = queue.Queue(maxsize=1)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def update(self, alert):
+        """Feed the alert condition of the latest frame."""
+        with self._lock:
+            self._streak = self._streak + 1 if alert else 0
+            if self._streak < self.debounce_frames:
+                return
+            now = time.monotonic()
+            if now - self._last_fired < self.cooldown:
+                self.suppressed += 1
+                return
+            self._last_fired = now
+        try:
+            self._pending.put_nowait(now)
+            self.fired += 1
+        except queue.Full:
+            self.suppressed += 1
+
+    def stop(self):
+        self._pending.put(None)
+
+    def _run(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            try:
+                self.play()
+            except Exception as e:
+                logger.error(f"Failed to play alert: {e}")
+
+
+class ProctoringPipeline:
+    """Capture thread -> ring buffer -> detection worker pool -> results, with alerts off the hot path."""
+
+    def __init__(self, capture, predictor, play_alert, workers=2, buffer_size=4, cooldown=3.0, debounce_frames=5,
+                 detect_every=10):
+        self.capture = capture
+        self.predictor = predictor
+        self.workers = workers
+        self.detect_every = detect_every
+        self.frames = FrameRingBuffer(buffer_size)
+        self.results = FrameRingBuffer(buffer_size)
+        self.alerts = AlertDispatcher(play_alert, cooldown=cooldown, debounce_frames=debounce_frames)
+        self.stats = PipelineStats()
+        self._running = threading.Event()
+        self._threads = []
+        self._active_workers = 0
+        self._workers_lock = threading.Lock()
+
+    @property
+    def dropped(self):
+        return self.frames.dropped + self.results.dropped
+
+    def start(self):
+        self._running.set()
+        self._active_workers = self.workers
+        self.alerts.start()
+        self._threads = [threading.Thread(target=self._capture_loop, name="capture", daemon=True)]
+        for i in range(self.workers):
+            # Each worker tracks faces across the frames it receives
+            analyzer = FrameAnalyzer(self.predictor, detect_every=self.detect_every)
+            self._threads.append(
+                threading.Thread(target=self._detect_loop, args=(analyzer,), name=f"detect-{i}", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        self.frames.close()
+        self.results.close()
+        self.alerts.stop()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def next_result(self, timeout=1.0):
+        """Return the next (seq, frame, result) tuple, or None."""
+        return self.results.get(timeout=timeout)
+
+    def _capture_loop(self):
+        seq = 0
+        while self._running.is_set():
+            ret, frame = self.capture.read()
+            if not ret:
+                break
+            self.stats.captured += 1
+            self.frames.put((seq, time.perf_counter(), frame))
+            seq += 1
+        self.frames.close()
+
+    def _detect_loop(self, analyzer):
+        while self._running.is_set():
+            item = self.frames.get(timeout=0.5)
+            if item is None:
+                if self.frames.closed:
+                    break
+                continue
+            seq, captured_at, frame = item
+            result = analyzer.analyze(frame)
+            self.stats.frame_processed(captured_at)
+            self.alerts.update(result["alert"])
+            self.results.put((seq, frame, result))
+        with self._workers_lock:
+            self._active_workers -= 1
+            if self._active_workers == 0:
+                self.results.close()
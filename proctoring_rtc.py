@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import dlib
+from aiortc.mediastreams import MediaStreamError
+
+from proctoring_analysis import FrameAnalyzer
+from proctoring_pipeline import PipelineStats
+
+logger = logging.getLogger("proctoring-rtc")
+
+# Per-process state of the analysis workers: the shared predictor and one analyzer per peer
+_predictor = None
+_detect_every = 10
+_analyzers = {}
+
+
+def _init_worker(predictor_path, detect_every):
+    global _predictor, _detect_every
+    _predictor = dlib.shape_predictor(predictor_path)
+    _detect_every = detect_every
+
+
+def _analyze(peer_id, gray):
+    analyzer = _analyzers.get(peer_id)
+    if analyzer is None:
+        analyzer = _analyzers[peer_id] = FrameAnalyzer(_predictor, detect_every=_detect_every)
+    return result_message(analyzer.analyze_gray(gray))
+
+
+def _release(peer_id):
+    _analyzers.pop(peer_id, None)
+
+
+def result_message(result):
+    """Strip an analysis result down to what the browser needs, as JSON-serializable values."""
+    return {
+        "face_detected": result["face_detected"],
+        "alert": result["alert"],
+        "faces": [
+            {
+                "box": face["box"],
+                "ear": round(face["ear"], 3),
+                "suspicious": face["suspicious"],
+                "angle": round(face["angle"], 1),
+                "head_pose": face["head_pose"] and [round(v, 1) for v in face["head_pose"]],
+                "within_view": face["within_view"],
+            }
+            for face in result["faces"]
+        ],
+    }
+
+
+class AnalysisPool:
+    """Runs frame analysis in worker processes, off the aiortc event loop.
+
+    Each worker is a single-process executor and every peer is pinned to one
+    of them, so the face tracker state of a candidate stays in one process.
+    New peers go to the worker with the fewest peers.
+    """
+
+    def __init__(self, predictor_path, workers=None, detect_every=10):
+        workers = workers or os.cpu_count() or 1
+        self._shards = [
+            ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(predictor_path, detect_every))
+            for _ in range(workers)
+        ]
+        self._load = [0] * workers
+        self._assigned = {}
+
+    def assign(self, peer_id):
+        shard = min(range(len(self._shards)), key=self._load.__getitem__)
+        self._load[shard] += 1
+        self._assigned[peer_id] = shard
+        return shard
+
+    async def analyze(self, peer_id, gray):
+        shard = self._assigned[peer_id]
+        return await asyncio.get_running_loop().run_in_executor(self._shards[shard], _analyze, peer_id, gray)
+
+    def release(self, peer_id):
+        shard = self._assigned.pop(peer_id, None)
+        if shard is None:
+            return
+        self._load[shard] -= 1
+        self._shards[shard].submit(_release, peer_id)
+
+    def shutdown(self):
+        for shard in self._shards:
+            shard.shutdown(wait=False, cancel_futures=True)
+
+
+class TrackProctor:
+    """Consumes a candidate's remote video track and sends analysis results over the data channel.
+
+    At most one frame per peer is in flight; frames that arrive while the
+    previous one is still being analyzed are skipped rather than queued, so a
+    slow worker adds no lag.
+    """
+
+    def __init__(self, pool, peer_id, track):
+        self.pool = pool
+        self.peer_id = peer_id
+        self.track = track
+        self.channel = None
+        self.received = 0
+        self.skipped = 0
+        self.stats = PipelineStats()
+        self._task = None
+
+    def start(self):
+        self.pool.assign(self.peer_id)
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.pool.release(self.peer_id)
+
+    async def _run(self):
+        pending = None
+        while True:
+            try:
+                frame = await self.track.recv()
+            except MediaStreamError:
+                break
+            self.received += 1
+            if pending is not None and not pending.done():
+                self.skipped += 1
+                continue
+            # The luma plane is all the detector needs and a third of the BGR payload
+            received_at = time.perf_counter()
+            gray = frame.to_ndarray(format="gray")
+            pending = asyncio.ensure_future(self._analyze(gray, frame.time, received_at))
+        if pending is not None:
+            await pending
+
+    async def _analyze(self, gray, frame_time, received_at):
+        try:
+            message = await self.pool.analyze(self.peer_id, gray)
+        except Exception as e:
+            logger.error(f"Analysis failed for peer {self.peer_id}: {e}")
+            return
+        self.stats.frame_processed(received_at)
+        message["time"] = frame_time
+        if self.channel is not None and self.channel.readyState == "open":
+            self.channel.send(json.dumps(message))
+
+    def metrics(self):
+        return {
+            "received": self.received,
+            "processed": self.stats.processed,
+            "skipped": self.skipped,
+            "fps": self.stats.fps,
+            "lag_p50_ms": self.stats.latency.percentile(50) * 1000,
+            "lag_p95_ms": self.stats.latency.percentile(95) * 1000,
+        }
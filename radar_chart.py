@@ -0,0 +1,70 @@
+import io
+import threading
+
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import NullFormatter
+
+
+class RadarChartRenderer:
+    """Radar chart whose figure, axes, labels and title are built once; each render only updates the polygon."""
+
+    def __init__(self, labels, figsize=(3, 3)):
+        self.labels = tuple(labels)
+        angles = np.linspace(0, 2 * np.pi, len(self.labels), endpoint=False)
+        self._angles = np.concatenate([angles, angles[:1]])
+        self._lock = threading.Lock()
+
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(projection="polar")
+
+        zeros = np.zeros_like(self._angles)
+        self._fill = self.ax.fill(self._angles, zeros, color='blue', alpha=0.3)[0]
+        self._line = self.ax.plot(self._angles, zeros, color='blue', linewidth=2)[0]
+
+        # Labels and Formatting
+        self.ax.yaxis.set_major_formatter(NullFormatter())
+        self.ax.set_xticks(angles)
+        self.ax.set_xticklabels(self.labels, fontsize=10, color="black")
+        self.ax.set_title("Performance Overview", fontsize=11, fontweight="bold", color="#2C3E50")
+
+        # Labels and title never move, so the tight bounding box is computed once
+        self.canvas.draw()
+        renderer = self.canvas.get_renderer()
+        self._bbox = self.figure.get_tightbbox(renderer).padded(rcParams["savefig.pad_inches"])
+
+    def render(self, scores, out=None):
+        """Render `scores` as a transparent PNG into `out` (a new BytesIO by default) and return it."""
+        if len(scores) != len(self.labels):
+            raise ValueError(f"Expected {len(self.labels)} scores, got {len(scores)}")
+        out = out if out is not None else io.BytesIO()
+        closed = np.append(np.asarray(scores, dtype=float), scores[0])
+        with self._lock:
+            self._fill.set_xy(np.column_stack([self._angles, closed]))
+            self._line.set_data(self._angles, closed)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.figure.savefig(out, format="png", bbox_inches=self._bbox, transparent=True)
+        out.seek(0)
+        return out
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def get_renderer(labels):
+    """Return the process-wide renderer for this set of labels, building it on first use."""
+    labels = tuple(labels)
+    with _renderers_lock:
+        renderer = _renderers.get(labels)
+        if renderer is None:
+            renderer = _renderers[labels] = RadarChartRenderer(labels)
+        return renderer
+
+
+def render_radar_chart(scores, labels, out=None):
+    return get_renderer(labels).render(scores, out)
@@ -0,0 +1,50 @@
+import argparse
+import io
+import random
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from radar_chart import RadarChartRenderer
+from report_generator import generate_radar_chart
+
+LABELS = ["Tech", "Aptitude", "Soft Skills", "Culture Fit"]
+
+
+def random_scores(count, seed=0):
+    rng = random.Random(seed)
+    return [[rng.randint(0, 100) for _ in LABELS] for _ in range(count)]
+
+
+def bench_baseline(score_sets):
+    start = time.perf_counter()
+    for scores in score_sets:
+        generate_radar_chart(scores, LABELS, io.BytesIO())
+    return time.perf_counter() - start
+
+
+def bench_renderer(score_sets):
+    start = time.perf_counter()
+    renderer = RadarChartRenderer(LABELS)  # template setup is part of the measured cost
+    for scores in score_sets:
+        renderer.render(scores)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ms/chart for generate_radar_chart vs RadarChartRenderer.")
+    parser.add_argument("--counts", default="1000,10000", help="comma separated chart counts")
+    args = parser.parse_args()
+
+    print(f"{'charts':>7} {'baseline ms/chart':>18} {'renderer ms/chart':>18} {'speedup':>8}")
+    for count in (int(c) for c in args.counts.split(",")):
+        score_sets = random_scores(count)
+        baseline = bench_baseline(score_sets)
+        renderer = bench_renderer(score_sets)
+        print(f"{count:>7} {baseline / count * 1000:>18.2f} {renderer / count * 1000:>18.2f} {baseline / renderer:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,8 @@
 import logging
 import asyncio
 import os
-import markdown
 import tempfile
 from datetime import datetime
-from fpdf import FPDF
-import json
 from livekit.plugins.openai import LLM
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -20,29 +17,87 @@ from livekit.agents import (
 from livekit.agents.pipeline import VoicePipelineAgent
 from livekit.plugins import deepgram, silero, turn_detector
 
+from evaluation_parser import (
+    OVERALL_SCHEMA,
+    STAGE_SCHEMA,
+    STRENGTHS_SCHEMA,
+    EvaluationParseError,
+    EvaluationParser,
+    parse_metrics,
+)
+from interview_report import shared_render_queue
+from knowledge_base import knowledge_base
+from llm_cache import LLMResponseCache, cached_generate
+
 load_dotenv(dotenv_path=".env.local")
 logger = logging.getLogger("interview-agent")
 os.environ["HUGGINGFACE_HUB_TOKEN"] = os.getenv("HUGGINGFACE_HUB_TOKEN")
 
+LLM_MODEL = "llama3-8b-8192"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("cache", "llm_responses.sqlite"))
+
+# Call sites whose prompts repeat across candidates and may be answered from the response cache
+CACHED_CALL_SITES = {
+    "name_extraction": True,
+    "company_question": True,
+    "final_question": True,
+}
+
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["knowledge_base"] = knowledge_base.compile()
+    proc.userdata["llm_cache"] = LLMResponseCache(path=LLM_CACHE_PATH)
+    proc.userdata["report_queue"] = shared_render_queue()
 
 def load_company_knowledge():
-    """Load company information from the knowledge base file."""
-    file_path = os.path.join("data", "company_info.md")
-    if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-            return markdown.markdown(content)
-    else:
-        logger.warning(f"Knowledge base file {file_path} not found")
+    """Load company information from the shared knowledge base."""
+    company_info = knowledge_base.load(os.path.join("data", "company"))
+    if not company_info:
         return "No company information available."
+    return company_info
+
+class ScoringQueue:
+    """Background queue that scores stage answers while the conversation continues."""
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self._queue = None
+        self._tasks = []
+
+    def submit(self, job):
+        """Queue a coroutine function for scoring. Never waits on the LLM."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._queue.put_nowait(job)
+
+    async def join(self):
+        """Wait until every submitted job has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"Background scoring failed: {str(e)}")
+            finally:
+                self._queue.task_done()
 
 class InterviewAgent(VoicePipelineAgent):
     """Comprehensive interview agent that handles the entire interview process."""
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, response_cache=None, report_queue=None, model_id=LLM_MODEL, **kwargs):
         super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+        self.report_queue = report_queue or shared_render_queue()
+        self.model_id = model_id
         self.company_knowledge = load_company_knowledge()
         self.candidate_name = "Candidate"
         self.interview_data = {
@@ -51,7 +106,11 @@ class InterviewAgent(VoicePipelineAgent):
             "stages": {},
             "overall_score": 0,
             "overall_feedback": "",
+            "strengths": [],
+            "improvements": [],
         }
+        self.scoring = ScoringQueue()
+        self.evaluation_parser = EvaluationParser(self.llm)
         
     async def run_interview(self):
         """Run the complete interview process from welcome to closing."""
@@ -96,7 +155,7 @@ class InterviewAgent(VoicePipelineAgent):
         Respond with ONLY the name, nothing else. If you can't determine the name, respond with "Candidate".
         """
         
-        extracted_name = await self.llm.generate(name_prompt)
+        extracted_name = await self.generate_response(name_prompt, call_site="name_extraction")
         self.candidate_name = extracted_name.strip() if extracted_name.strip() else "Candidate"
         self.interview_data["candidate_name"] = self.candidate_name
         logger.info(f"Identified candidate as: {self.candidate_name}")
@@ -118,7 +177,7 @@ class InterviewAgent(VoicePipelineAgent):
             Answer their question concisely and professionally. If you don't have enough information, politely let them know.
             """
             
-            company_answer = await self.llm.generate(answer_prompt)
+            company_answer = await self.generate_response(answer_prompt, call_site="company_question")
             await self.say(company_answer)
         else:
             await self.say(f"Great, {self.candidate_name}. Let's get started with the interview then.")
@@ -153,37 +212,21 @@ class InterviewAgent(VoicePipelineAgent):
         Please provide:
         1. A brief (2-3 sentence) evaluation of their technical skills based on this response
         2. A score from 1-10 (where 10 is excellent)
-        3. A follow-up comment or question that shows you were listening
         
         Format your response as JSON:
         {{
             "evaluation": "your evaluation here",
-            "score": number,
-            "follow_up": "your follow-up here"
+            "score": number
         }}
         """
         
-        tech_analysis_json = await self.llm.generate(tech_analysis_prompt)
-        try:
-            tech_analysis = json.loads(tech_analysis_json)
-            tech_evaluation = tech_analysis.get("evaluation", "Thank you for sharing your experience.")
-            tech_score = tech_analysis.get("score", 5)
-            tech_follow_up = tech_analysis.get("follow_up", "That's interesting. Let's continue with the next section.")
-            
-            # Store the data for report
-            self.interview_data["stages"]["technical"] = {
-                "question": tech_question,
-                "response": tech_response,
-                "evaluation": tech_evaluation,
-                "score": tech_score
-            }
-            
-            # Respond to candidate
-            await self.say(f"{tech_follow_up}")
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse tech analysis JSON: {tech_analysis_json}")
-            await self.say("Thank you for sharing your technical experience. That gives me a good understanding of your background.")
+        # Score in the background; the spoken follow-up does not wait on it
+        self.scoring.submit(lambda: self._score_stage("technical", tech_question, tech_response, tech_analysis_prompt))
+        tech_follow_up = await self._follow_up(
+            tech_question, tech_response,
+            fallback="Thank you for sharing your technical experience. That gives me a good understanding of your background.",
+        )
+        await self.say(tech_follow_up)
         
         # Brief pause before next stage
         await asyncio.sleep(1)
@@ -215,37 +258,21 @@ class InterviewAgent(VoicePipelineAgent):
         Please provide:
         1. A brief (2-3 sentence) evaluation of their conflict resolution and teamwork skills
         2. A score from 1-10 (where 10 is excellent)
-        3. A follow-up comment that shows you were listening
         
         Format your response as JSON:
         {{
             "evaluation": "your evaluation here",
-            "score": number,
-            "follow_up": "your follow-up here"
+            "score": number
         }}
         """
         
-        soft_analysis_json = await self.llm.generate(soft_analysis_prompt)
-        try:
-            soft_analysis = json.loads(soft_analysis_json)
-            soft_evaluation = soft_analysis.get("evaluation", "Thank you for sharing your approach.")
-            soft_score = soft_analysis.get("score", 5)
-            soft_follow_up = soft_analysis.get("follow_up", "That's valuable insight. Let's move on.")
-            
-            # Store the data for report
-            self.interview_data["stages"]["soft_skills"] = {
-                "question": soft_question,
-                "response": soft_response,
-                "evaluation": soft_evaluation,
-                "score": soft_score
-            }
-            
-            # Respond to candidate
-            await self.say(f"{soft_follow_up}")
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse soft skills analysis JSON: {soft_analysis_json}")
-            await self.say("Thank you for sharing how you handle conflicts. That gives me good insight into your interpersonal skills.")
+        # Score in the background; the spoken follow-up does not wait on it
+        self.scoring.submit(lambda: self._score_stage("soft_skills", soft_question, soft_response, soft_analysis_prompt))
+        soft_follow_up = await self._follow_up(
+            soft_question, soft_response,
+            fallback="Thank you for sharing how you handle conflicts. That gives me good insight into your interpersonal skills.",
+        )
+        await self.say(soft_follow_up)
         
         # Brief pause before next stage
         await asyncio.sleep(1)
@@ -280,37 +307,21 @@ class InterviewAgent(VoicePipelineAgent):
         Please provide:
         1. A brief (2-3 sentence) evaluation of their potential cultural fit with the company
         2. A score from 1-10 (where 10 is excellent)
-        3. A follow-up comment that shows engagement with their response
         
         Format your response as JSON:
         {{
             "evaluation": "your evaluation here",
-            "score": number,
-            "follow_up": "your follow-up here"
+            "score": number
         }}
         """
         
-        culture_analysis_json = await self.llm.generate(culture_analysis_prompt)
-        try:
-            culture_analysis = json.loads(culture_analysis_json)
-            culture_evaluation = culture_analysis.get("evaluation", "Thank you for sharing your preferences.")
-            culture_score = culture_analysis.get("score", 5)
-            culture_follow_up = culture_analysis.get("follow_up", "That's helpful to know. Thank you.")
-            
-            # Store the data for report
-            self.interview_data["stages"]["culture_fit"] = {
-                "question": culture_question,
-                "response": culture_response,
-                "evaluation": culture_evaluation,
-                "score": culture_score
-            }
-            
-            # Respond to candidate
-            await self.say(f"{culture_follow_up}")
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse culture fit analysis JSON: {culture_analysis_json}")
-            await self.say("Thank you for sharing your thoughts on our company culture. It helps us understand how you might fit into our team.")
+        # Score in the background; the spoken follow-up does not wait on it
+        self.scoring.submit(lambda: self._score_stage("culture_fit", culture_question, culture_response, culture_analysis_prompt))
+        culture_follow_up = await self._follow_up(
+            culture_question, culture_response,
+            fallback="Thank you for sharing your thoughts on our company culture. It helps us understand how you might fit into our team.",
+        )
+        await self.say(culture_follow_up)
         
         # Brief pause before next stage
         await asyncio.sleep(1)
@@ -319,51 +330,8 @@ class InterviewAgent(VoicePipelineAgent):
         """Handle the closing stage and final evaluation."""
         logger.info("Starting Closing stage")
         
-        # Generate overall feedback
-        overall_prompt = f"""
-        You are a senior hiring manager reviewing interview results for {self.candidate_name}.
-        
-        Based on these evaluations:
-        
-        Technical Assessment: {self.interview_data.get("stages", {}).get("technical", {}).get("evaluation", "No data")}
-        Technical Score: {self.interview_data.get("stages", {}).get("technical", {}).get("score", 0)}
-        
-        Soft Skills Assessment: {self.interview_data.get("stages", {}).get("soft_skills", {}).get("evaluation", "No data")}
-        Soft Skills Score: {self.interview_data.get("stages", {}).get("soft_skills", {}).get("score", 0)}
-        
-        Culture Fit Assessment: {self.interview_data.get("stages", {}).get("culture_fit", {}).get("evaluation", "No data")}
-        Culture Fit Score: {self.interview_data.get("stages", {}).get("culture_fit", {}).get("score", 0)}
-        
-        Please provide:
-        1. A concise overall evaluation (3-4 sentences) of the candidate
-        2. An overall score from 1-10
-        3. A recommendation (Strongly Recommend, Recommend, Consider, Do Not Recommend)
-        
-        Format your response as JSON:
-        {{
-            "overall_evaluation": "your evaluation here",
-            "overall_score": number,
-            "recommendation": "your recommendation here"
-        }}
-        """
-        
-        overall_analysis_json = await self.llm.generate(overall_prompt)
-        try:
-            overall_analysis = json.loads(overall_analysis_json)
-            overall_evaluation = overall_analysis.get("overall_evaluation", "Thank you for participating in this interview.")
-            overall_score = overall_analysis.get("overall_score", 5)
-            recommendation = overall_analysis.get("recommendation", "Consider")
-            
-            # Store the overall data for report
-            self.interview_data["overall_feedback"] = overall_evaluation
-            self.interview_data["overall_score"] = overall_score
-            self.interview_data["recommendation"] = recommendation
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse overall analysis JSON: {overall_analysis_json}")
-            self.interview_data["overall_feedback"] = "Thank you for participating in this interview."
-            self.interview_data["overall_score"] = 5
-            self.interview_data["recommendation"] = "Consider"
+        # The final evaluation runs in the background while we wrap up with the candidate
+        summary_task = asyncio.create_task(self.summarize_interview())
         
         # Closing message
         closing_message = f"""
@@ -387,173 +355,55 @@ class InterviewAgent(VoicePipelineAgent):
             provide a helpful, concise response to their question. If you don't have enough information, politely let them know.
             """
             
-            final_answer = await self.llm.generate(final_answer_prompt)
+            final_answer = await self.generate_response(final_answer_prompt, call_site="final_question")
             await self.say(final_answer)
         else:
             await self.say(f"Thank you again, {self.candidate_name}. It was a pleasure speaking with you today. Have a great day!")
-    
-    async def generate_pdf_report(self):
-        """Generate and save a PDF report of the interview."""
-        logger.info("Generating PDF report")
         
-        try:
-            # Create PDF object
-            pdf = InterviewReportPDF(self.interview_data)
-            
-            # Generate the report
-            report_filename = f"interview_report_{self.candidate_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            report_path = os.path.join("reports", report_filename)
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(report_path), exist_ok=True)
-            
-            # Save the PDF
-            pdf.generate_report()
-            pdf.output(report_path)
-            logger.info(f"PDF report saved to {report_path}")
-            
-            # Log the report generation
-            logger.info(f"Interview report for {self.candidate_name} generated successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to generate PDF report: {str(e)}")
-
-class InterviewReportPDF(FPDF):
-    """Custom PDF generator for interview reports."""
+        await summary_task
     
-    def __init__(self, interview_data):
-        super().__init__()
-        self.interview_data = interview_data
-        self.set_auto_page_break(auto=True, margin=15)
-        self.set_margins(left=15, top=15, right=15)
-        
-    def header(self):
-        """Generate report header."""
-        # Add company logo if available
-        self.image('ICEBREAKERS.png', 10, 8, 33)
-        
-        # Set font and colors
-        self.set_font('helvetica', 'B', 15)
-        self.set_text_color(0, 51, 102)  # Dark blue
-        
-        # Company name
-        self.cell(0, 10, 'Company Interview Report', 0, 1, 'C')
-        
-        # Date and reference number
-        self.set_font('helvetica', '', 10)
-        self.cell(0, 10, f"Date: {self.interview_data['interview_date']}", 0, 1, 'R')
-        
-        # Line break
-        self.ln(5)
-    
-    def footer(self):
-        """Generate report footer."""
-        self.set_y(-15)
-        self.set_font('helvetica', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-    
-    def chapter_title(self, title):
-        """Add a chapter title."""
-        self.set_font('helvetica', 'B', 12)
-        self.set_fill_color(240, 240, 240)  # Light gray
-        self.cell(0, 10, title, 0, 1, 'L', True)
-        self.ln(4)
-    
-    def content_text(self, text):
-        """Add content text."""
-        self.set_font('helvetica', '', 11)
-        self.multi_cell(0, 5, text)
-        self.ln(5)
-    
-    def score_indicator(self, score):
-        """Add a visual score indicator."""
-        self.set_font('helvetica', 'B', 10)
-        self.cell(30, 10, f"Score: {score}/10", 0, 0)
-        
-        # Draw score bar
-        self.set_draw_color(0, 0, 0)
-        self.set_fill_color(220, 220, 220)  # Light gray for background
-        self.rect(65, self.get_y() + 3, 100, 5, 'F')
-        
-        # Color depends on score
-        if score >= 8:
-            self.set_fill_color(0, 153, 0)  # Green
-        elif score >= 5:
-            self.set_fill_color(255, 153, 0)  # Orange
-        else:
-            self.set_fill_color(204, 0, 0)  # Red
-            
-        self.rect(65, self.get_y() + 3, score * 10, 5, 'F')
-        self.ln(10)
-    
-    def generate_report(self):
-        """Generate the complete report."""
-        self.add_page()
-        
-        # Candidate information
-        self.chapter_title('Candidate Information')
-        self.content_text(f"Name: {self.interview_data['candidate_name']}")
-        self.content_text(f"Interview Date: {self.interview_data['interview_date']}")
-        self.ln(5)
-        
-        # Technical assessment
-        if 'technical' in self.interview_data.get('stages', {}):
-            tech_data = self.interview_data['stages']['technical']
-            self.chapter_title('Technical Assessment')
-            self.content_text(f"Question: {tech_data.get('question', 'N/A')}")
-            self.content_text(f"Response: {tech_data.get('response', 'N/A')}")
-            self.content_text(f"Evaluation: {tech_data.get('evaluation', 'N/A')}")
-            self.score_indicator(tech_data.get('score', 0))
-        
-        # Soft skills assessment
-        if 'soft_skills' in self.interview_data.get('stages', {}):
-            soft_data = self.interview_data['stages']['soft_skills']
-            self.chapter_title('Soft Skills Assessment')
-            self.content_text(f"Question: {soft_data.get('question', 'N/A')}")
-            self.content_text(f"Response: {soft_data.get('response', 'N/A')}")
-            self.content_text(f"Evaluation: {soft_data.get('evaluation', 'N/A')}")
-            self.score_indicator(soft_data.get('score', 0))
-        
-        # Culture fit assessment
-        if 'culture_fit' in self.interview_data.get('stages', {}):
-            culture_data = self.interview_data['stages']['culture_fit']
-            self.chapter_title('Culture Fit Assessment')
-            self.content_text(f"Question: {culture_data.get('question', 'N/A')}")
-            self.content_text(f"Response: {culture_data.get('response', 'N/A')}")
-            self.content_text(f"Evaluation: {culture_data.get('evaluation', 'N/A')}")
-            self.score_indicator(culture_data.get('score', 0))
-        
-        # Overall evaluation
-        self.add_page()
-        self.chapter_title('Overall Evaluation')
-        self.content_text(self.interview_data.get('overall_feedback', 'No overall feedback provided.'))
-        self.score_indicator(self.interview_data.get('overall_score', 0))
-        
-        # Recommendation
-        self.chapter_title('Recommendation')
-        recommendation = self.interview_data.get('recommendation', 'No recommendation provided.')
-        self.set_font('helvetica', 'B', 12)
-        
-        # Set color based on recommendation
-        if recommendation == "Strongly Recommend":
-            self.set_text_color(0, 102, 0)  # Dark green
-        elif recommendation == "Recommend":
-            self.set_text_color(0, 153, 0)  # Green
-        elif recommendation == "Consider":
-            self.set_text_color(255, 153, 0)  # Orange
-        else:
-            self.set_text_color(204, 0, 0)  # Red
-            
-        self.cell(0, 10, recommendation, 0, 1, 'L')
-        self.set_text_color(0, 0, 0)  # Reset to black
+    async def summarize_interview(self):
+        """Generate the overall evaluation, strengths and improvements once stage scoring is done."""
+        await self.scoring.join()
+        self.scoring.stop()
+        
+        stages = self.interview_data.get("stages", {})
+        
+        # Generate overall feedback
+        overall_prompt = f"""
+        You are a senior hiring manager reviewing interview results for {self.candidate_name}.
+        
+        Based on these evaluations:
+        
+        Technical Assessment: {stages.get("technical", {}).get("evaluation", "No data")}
+        Technical Score: {stages.get("technical", {}).get("score", 0)}
+        
+        Soft Skills Assessment: {stages.get("soft_skills", {}).get("evaluation", "No data")}
+        Soft Skills Score: {stages.get("soft_skills", {}).get("score", 0)}
+        
+        Culture Fit Assessment: {stages.get("culture_fit", {}).get("evaluation", "No data")}
+        Culture Fit Score: {stages.get("culture_fit", {}).get("score", 0)}
+        
+        Please provide:
+        1. A concise overall evaluation (3-4 sentences) of the candidate
+        2. An overall score from 1-10
+        3. A recommendation (Strongly Recommend, Recommend, Consider, Do Not Recommend)
+        
+        Format your response as JSON:
+        {{
+            "overall_evaluation": "your evaluation here",
+            "overall_score": number,
+            "recommendation": "your recommendation here"
+        }}
+        """
         
         # Strengths and areas for improvement
         strengths_weaknesses_prompt = f"""
         Based on these interview evaluations:
         
-        Technical: {self.interview_data.get('stages', {}).get('technical', {}).get('evaluation', 'No data')}
-        Soft Skills: {self.interview_data.get('stages', {}).get('soft_skills', {}).get('evaluation', 'No data')}
-        Culture Fit: {self.interview_data.get('stages', {}).get('culture_fit', {}).get('evaluation', 'No data')}
+        Technical: {stages.get('technical', {}).get('evaluation', 'No data')}
+        Soft Skills: {stages.get('soft_skills', {}).get('evaluation', 'No data')}
+        Culture Fit: {stages.get('culture_fit', {}).get('evaluation', 'No data')}
         
         Please provide:
         1. Three key strengths of the candidate
@@ -566,18 +416,112 @@ class InterviewReportPDF(FPDF):
         }}
         """
         
-        # This should be run before the report generation, but for demonstration,
-        # we'll include placeholder data
-        strengths = ["Technical expertise", "Communication skills", "Problem-solving ability"]
-        improvements = ["Could improve leadership skills", "May need more experience with team projects"]
+        # LLM and parse failures are returned rather than raised, so the report always renders
+        overall_analysis_json, strengths_json = await asyncio.gather(
+            self.llm.generate(overall_prompt),
+            self.llm.generate(strengths_weaknesses_prompt),
+            return_exceptions=True,
+        )
+        
+        overall_analysis, strengths_analysis = await asyncio.gather(
+            self._parse_summary(overall_analysis_json, OVERALL_SCHEMA, "overall analysis"),
+            self._parse_summary(strengths_json, STRENGTHS_SCHEMA, "strengths analysis"),
+            return_exceptions=True,
+        )
+        
+        if isinstance(overall_analysis, Exception):
+            logger.error(f"Overall analysis failed: {overall_analysis!r}. Raw response: {overall_analysis_json}")
+            self.interview_data["overall_feedback"] = "Thank you for participating in this interview."
+            self.interview_data["overall_score"] = 5
+            self.interview_data["recommendation"] = "Consider"
+            self.interview_data["needs_review"] = True
+        else:
+            # Store the overall data for report
+            self.interview_data["overall_feedback"] = overall_analysis["overall_evaluation"]
+            self.interview_data["overall_score"] = overall_analysis["overall_score"]
+            self.interview_data["recommendation"] = overall_analysis["recommendation"]
+        
+        if isinstance(strengths_analysis, Exception):
+            logger.error(f"Strengths analysis failed: {strengths_analysis!r}. Raw response: {strengths_json}")
+            self.interview_data["needs_review"] = True
+        else:
+            self.interview_data["strengths"] = strengths_analysis["strengths"]
+            self.interview_data["improvements"] = strengths_analysis["improvements"]
+        
+        logger.info(f"Evaluation parsing metrics: {parse_metrics.snapshot()}")
+    
+    async def _parse_summary(self, response, schema, name):
+        """Parse a summary LLM response; an exception from the LLM call is raised for gather to return."""
+        if isinstance(response, Exception):
+            raise response
+        return await self.evaluation_parser.parse(response, schema, name)
+    
+    async def generate_response(self, prompt, call_site=None):
+        """Call the LLM, going through the response cache for call sites that enable it."""
+        return await cached_generate(
+            self.llm, prompt, self.model_id,
+            cache=self.response_cache,
+            use_cache=CACHED_CALL_SITES.get(call_site, False),
+        )
+    
+    async def _score_stage(self, stage, question, response, analysis_prompt):
+        """Evaluate one stage answer and store it for the report."""
+        analysis_json = await self.llm.generate(analysis_prompt)
+        stage_data = {"question": question, "response": response}
+        try:
+            analysis = await self.evaluation_parser.parse(analysis_json, STAGE_SCHEMA, f"{stage} analysis")
+            stage_data["evaluation"] = analysis["evaluation"]
+            stage_data["score"] = analysis["score"]
+        except EvaluationParseError as e:
+            # Keep the answer in the report and flag it instead of dropping the stage
+            logger.error(f"{str(e)}. Raw response: {analysis_json}")
+            stage_data["evaluation"] = "Automatic evaluation failed, this answer needs manual review."
+            stage_data["needs_review"] = True
+        
+        # Store the data for report
+        self.interview_data["stages"][stage] = stage_data
+        logger.info(f"Scored {stage} stage: {stage_data.get('score', 'needs review')}")
+    
+    async def _follow_up(self, question, response, fallback):
+        """Generate a short spoken follow-up, independent of the stage evaluation."""
+        follow_up_prompt = f"""
+        You are interviewing {self.candidate_name}. They were asked:
+        "{question}"
+        
+        Their response was:
+        "{response}"
+        
+        Reply with one short follow-up comment that shows you were listening. Respond with ONLY the comment.
+        """
         
-        self.chapter_title('Key Strengths')
-        for strength in strengths:
-            self.content_text(f"• {strength}")
+        try:
+            follow_up = await self.llm.generate(follow_up_prompt)
+        except Exception as e:
+            logger.error(f"Failed to generate follow-up: {str(e)}")
+            return fallback
+        return follow_up.strip() or fallback
+    
+    async def generate_pdf_report(self):
+        """Queue the PDF report of the interview and wait for it without blocking the event loop."""
+        logger.info("Generating PDF report")
         
-        self.chapter_title('Areas for Improvement')
-        for improvement in improvements:
-            self.content_text(f"• {improvement}")
+        try:
+            report_filename = f"interview_report_{self.candidate_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            report_path = os.path.join("reports", report_filename)
+            
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
+            
+            # Render from a snapshot in the report worker process
+            render_seconds = await self.report_queue.submit(self.interview_data, report_path)
+            logger.info(f"PDF report saved to {report_path} in {render_seconds:.2f}s")
+            
+            # Log the report generation
+            logger.info(f"Interview report for {self.candidate_name} generated successfully")
+            logger.info(f"Report queue: {self.report_queue.stats()}")
+            
+        except Exception as e:
+            logger.error(f"Failed to generate PDF report: {str(e)}")
 
 async def entrypoint(ctx: JobContext):
     logger.info(f"Connecting to room {ctx.room.name}")
@@ -590,7 +534,9 @@ async def entrypoint(ctx: JobContext):
     agent = InterviewAgent(
         vad=ctx.proc.userdata["vad"],
         stt=deepgram.STT(model="nova-2"),
-        llm=LLM.with_groq(model="llama3-8b-8192"),
+        llm=LLM.with_groq(model=LLM_MODEL),
+        response_cache=ctx.proc.userdata["llm_cache"],
+        report_queue=ctx.proc.userdata["report_queue"],
         tts=deepgram.TTS(),
         turn_detector=turn_detector.EOUModel(),
         min_endpointing_delay=0.5,
@@ -620,6 +566,8 @@ async def entrypoint(ctx: JobContext):
     
     # Stop the agent
     agent.stop()
+    await asyncio.to_thread(ctx.proc.userdata["llm_cache"].flush)
+    logger.info(f"LLM response cache: {ctx.proc.userdata['llm_cache'].stats()}")
     
     logger.info("Interview completed successfully")
 
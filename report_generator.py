@@ -5,17 +5,18 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Image, Spacer, Table, TableStyle
 from reportlab.lib import colors
-import os
+
+from radar_chart import render_radar_chart
 
 def generate_radar_chart(scores, labels, filename):
-    """Generates a radar chart (spider chart) and saves it as an image."""
+    """Generates a radar chart (spider chart) and saves it as an image to a path or file-like object."""
     num_vars = len(labels)
 
     # Compute angle for each category
     angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
     
     # Close the circle
-    scores += scores[:1]
+    scores = list(scores) + list(scores[:1])
     angles += angles[:1]
 
     fig, ax = plt.subplots(figsize=(3, 3), subplot_kw={"projection": "polar"})
@@ -33,7 +34,7 @@ def generate_radar_chart(scores, labels, filename):
 
 def generate_pdf_report(
     filename, candidate_name, role, tech_result, aptitude_result, soft_skills_result, culture_fit_result, summary,
-    tech_score, aptitude_score, soft_skills_score, culture_fit_score
+    tech_score, aptitude_score, soft_skills_score, culture_fit_score, verbose=True
 ):
     """Generates a structured PDF evaluation report with aligned content."""
     doc = SimpleDocTemplate(filename, pagesize=A4, topMargin=0.5 * inch)
@@ -58,16 +59,14 @@ def generate_pdf_report(
     elements.append(Table(candidate_info, colWidths=[2.5 * inch, 4.5 * inch]))
     elements.append(Spacer(1, 0.3 * inch))
 
-    # Generate Radar Chart
-    chart_filename = "performance_radar_chart.png"
-    generate_radar_chart(
+    # Generate Radar Chart in memory so concurrent reports never share a file
+    chart_buffer = render_radar_chart(
         [tech_score, aptitude_score, soft_skills_score, culture_fit_score], 
-        ["Tech", "Aptitude", "Soft Skills", "Culture Fit"], 
-        chart_filename
+        ["Tech", "Aptitude", "Soft Skills", "Culture Fit"]
     )
 
     # Image and Summary Side by Side
-    image = Image(chart_filename, width=2.0 * inch, height=2.0 * inch)
+    image = Image(chart_buffer, width=2.0 * inch, height=2.0 * inch)
     summary_text = Paragraph(f"<b>Summary:</b> {summary}", content_style)
     
     # Table to align image & summary
@@ -132,9 +131,8 @@ def generate_pdf_report(
     # Build PDF
     doc.build(elements)
     
-    # Clean up chart file
-    os.remove(chart_filename)
-    print(f"PDF evaluation report '{filename}' has been successfully generated.")
+    if verbose:
+        print(f"PDF evaluation report '{filename}' has been successfully generated.")
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+
+from knowledge_base import knowledge_base
+
+logger = logging.getLogger("retrieval")
+
+TOP_K = 3
+MAX_CHUNK_CHARS = 700
+# How often, at most, a search checks the knowledge base files for changes
+REFRESH_SECONDS = 30.0
+CONTEXT_HEADER = "Relevant company information for the candidate's last message:"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its "
+    "me my of on or our so that the their there this to was we what when where "
+    "which who why will with you your".split()
+)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def chunk_markdown(source, max_chars=MAX_CHUNK_CHARS):
+    """Split a Markdown document into (heading, text) chunks along headings and paragraphs."""
+    sections = []
+    heading, lines = "", []
+    for line in source.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            sections.append((heading, lines))
+            heading, lines = match.group(2).strip(), []
+        else:
+            lines.append(line)
+    sections.append((heading, lines))
+
+    chunks = []
+    for heading, lines in sections:
+        paragraphs = [p.strip() for p in "\n".join(lines).split("\n\n") if p.strip()]
+        current = ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) > max_chars:
+                chunks.append((heading, current))
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append((heading, current))
+    return chunks
+
+
+class ChunkIndex:
+    """BM25 index over chunks of the Markdown knowledge base.
+
+    An index built from a KnowledgeBase is rebuilt before a search when a
+    folder of the knowledge base changed on disk. The files are checked at
+    most once every `refresh_seconds`, so searches on the LLM path rarely stat.
+    """
+
+    def __init__(self, chunks, k1=1.5, b=0.75, kb=None, max_chars=MAX_CHUNK_CHARS, refresh_seconds=REFRESH_SECONDS):
+        self.k1 = k1
+        self.b = b
+        self.kb = kb
+        self.max_chars = max_chars
+        self.refresh_seconds = refresh_seconds
+        self._kb_signature = kb.refresh() if kb is not None else None
+        self._checked = time.monotonic()
+        self._index(chunks)
+
+    def _index(self, chunks):
+        self.chunks = chunks
+        self._term_freqs = []
+        self._lengths = []
+        doc_freqs = Counter()
+        for chunk in chunks:
+            terms = Counter(tokenize(f"{chunk['heading']} {chunk['text']}"))
+            self._term_freqs.append(terms)
+            self._lengths.append(sum(terms.values()))
+            doc_freqs.update(terms.keys())
+        self._avg_length = sum(self._lengths) / len(self._lengths) if chunks else 0.0
+        self._idf = {
+            term: math.log(1 + (len(chunks) - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freqs.items()
+        }
+
+    @classmethod
+    def build(cls, kb=knowledge_base, max_chars=MAX_CHUNK_CHARS):
+        """Chunk every document held by the knowledge base. Called from prewarm."""
+        return cls(_kb_chunks(kb, max_chars), kb=kb, max_chars=max_chars)
+
+    def refresh(self, force=False):
+        """Re-chunk the knowledge base if any of its folders changed since the index was built."""
+        if self.kb is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._checked < self.refresh_seconds:
+            return
+        self._checked = now
+        signature = self.kb.refresh()
+        if signature != self._kb_signature:
+            self._index(_kb_chunks(self.kb, self.max_chars))
+            self._kb_signature = signature
+
+    def search(self, query, k=TOP_K, folders=None):
+        """Return the top-k chunks for `query`, optionally restricted to some folders."""
+        self.refresh()
+        if not self.chunks:
+            return []
+        if folders is not None:
+            folders = {os.path.normpath(folder) for folder in folders}
+        query_terms = set(tokenize(query))
+        scored = []
+        for i, chunk in enumerate(self.chunks):
+            if folders is not None and chunk["folder"] not in folders:
+                continue
+            score = self._score(i, query_terms)
+            if score > 0:
+                scored.append((score, i))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [dict(self.chunks[i], score=score) for score, i in scored[:k]]
+
+    def _score(self, i, query_terms):
+        term_freqs = self._term_freqs[i]
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._avg_length)
+        score = 0.0
+        for term in query_terms:
+            freq = term_freqs.get(term)
+            if freq:
+                score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+        return score
+
+
+def _kb_chunks(kb, max_chars):
+    chunks = []
+    for path, source in kb.documents():
+        for heading, text in chunk_markdown(source, max_chars):
+            chunks.append({
+                "source": path,
+                "folder": os.path.dirname(path),
+                "heading": heading,
+                "text": text,
+            })
+    logger.info(f"built retrieval index with {len(chunks)} chunks")
+    return chunks
+
+
+def format_chunks(chunks):
+    parts = [CONTEXT_HEADER]
+    for chunk in chunks:
+        title = f"## {chunk['heading']}\n" if chunk["heading"] else ""
+        parts.append(f"{title}{chunk['text']}")
+    return "\n\n".join(parts)
+
+
+def retrieval_callback(index, folders=None, k=TOP_K):
+    """Build a `before_llm_cb` that adds the top-k chunks for the latest user turn to the context."""
+    from livekit.agents import llm
+
+    async def _before_llm(agent, chat_ctx):
+        user_messages = [m for m in chat_ctx.messages if m.role == "user" and isinstance(m.content, str)]
+        if not user_messages:
+            return None
+        chunks = index.search(user_messages[-1].content, k=k, folders=folders)
+        if not chunks:
+            return None
+        chat_ctx.messages[:] = [
+            m for m in chat_ctx.messages
+            if not (m.role == "system" and isinstance(m.content, str) and m.content.startswith(CONTEXT_HEADER))
+        ]
+        position = next(i for i, m in enumerate(chat_ctx.messages) if m is user_messages[-1])
+        chat_ctx.messages.insert(
+            position,
+            llm.ChatMessage.create(text=format_chunks(chunks), role="system"),
+        )
+        return None
+
+    return _before_llm
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from knowledge_base import KnowledgeBase
+from retrieval import TOP_K, ChunkIndex, format_chunks
+
+FOLDERS = ["data/company", "data/tech"]
+SYSTEM_PROMPT = (
+    "Start a technical skills Interview with the candidate."
+    "Keep your replies very short and crisp, do not use long sentances."
+)
+TURNS = [
+    "Hi, I'm ready to start. What does the company actually do?",
+    "I built a RAG pipeline with a vector database for customer support.",
+    "What kind of benefits and work-life balance do you offer?",
+    "I mostly work in Python, and I've deployed models on Kubernetes.",
+    "How would you test a system design for scalability?",
+    "Is the role more research or product engineering?",
+    "What products and services does the team ship?",
+    "I usually write unit tests before I optimize any code.",
+]
+
+
+def count_tokens(text):
+    try:
+        import tiktoken
+    except ImportError:
+        return len(text) // 4  # rough estimate for English text
+    return len(tiktoken.get_encoding("cl100k_base").encode(text))
+
+
+def build_prompts(kb, index, k):
+    full_context = "".join(kb.load(folder) for folder in FOLDERS)
+    full_prompt = f"{SYSTEM_PROMPT}Company background: {full_context}"
+    rows = []
+    for turn in TURNS:
+        start = time.perf_counter()
+        chunks = index.search(turn, k=k, folders=FOLDERS)
+        retrieved_prompt = f"{SYSTEM_PROMPT}\n\n{format_chunks(chunks)}"
+        search_ms = (time.perf_counter() - start) * 1000
+        rows.append({
+            "turn": turn,
+            "full_prompt": full_prompt,
+            "retrieved_prompt": retrieved_prompt,
+            "full_tokens": count_tokens(full_prompt),
+            "retrieved_tokens": count_tokens(retrieved_prompt),
+            "search_ms": search_ms,
+        })
+    return rows
+
+
+async def time_to_first_token(client, model, system_prompt, turn):
+    start = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": turn}],
+        max_tokens=32,
+        stream=True,
+    )
+    async for _ in stream:
+        break
+    ttft = time.perf_counter() - start
+    await stream.close()
+    return ttft * 1000
+
+
+async def measure_live(rows, model):
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(base_url="https://api.groq.com/openai/v1", api_key=os.environ["GROQ_API_KEY"])
+    for row in rows:
+        row["full_ttft_ms"] = await time_to_first_token(client, model, row["full_prompt"], row["turn"])
+        row["retrieved_ttft_ms"] = await time_to_first_token(client, model, row["retrieved_prompt"], row["turn"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full-folder prompts against top-k retrieval.")
+    parser.add_argument("--k", type=int, default=TOP_K)
+    parser.add_argument("--live", action="store_true", help="also measure time-to-first-token on Groq (needs GROQ_API_KEY)")
+    parser.add_argument("--model", default="llama-3.3-70b-versatile")
+    args = parser.parse_args()
+
+    kb = KnowledgeBase()
+    start = time.perf_counter()
+    kb.compile()
+    index = ChunkIndex.build(kb)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Index: {len(index.chunks)} chunks built in {build_ms:.1f} ms")
+
+    rows = build_prompts(kb, index, args.k)
+    if args.live:
+        asyncio.run(measure_live(rows, args.model))
+
+    print(f"{'turn':<50} {'full tok':>9} {'top-k tok':>9} {'saved':>7} {'search ms':>9}")
+    for row in rows:
+        saved = 1 - row["retrieved_tokens"] / row["full_tokens"]
+        print(f"{row['turn'][:50]:<50} {row['full_tokens']:>9} {row['retrieved_tokens']:>9} {saved:>6.0%} {row['search_ms']:>9.3f}")
+        if args.live:
+            print(f"{'':<50} TTFT {row['full_ttft_ms']:.0f} ms -> {row['retrieved_ttft_ms']:.0f} ms")
+
+    full = statistics.mean(row["full_tokens"] for row in rows)
+    retrieved = statistics.mean(row["retrieved_tokens"] for row in rows)
+    print(f"\nMean prompt tokens per turn: {full:.0f} -> {retrieved:.0f} ({1 - retrieved / full:.0%} fewer)")
+    print(f"Mean retrieval overhead per turn: {statistics.mean(row['search_ms'] for row in rows):.3f} ms")
+    if args.live:
+        full_ttft = statistics.median(row["full_ttft_ms"] for row in rows)
+        retrieved_ttft = statistics.median(row["retrieved_ttft_ms"] for row in rows)
+        print(f"Median time-to-first-token: {full_ttft:.0f} ms -> {retrieved_ttft:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
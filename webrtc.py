@@ -1,21 +1,20 @@
+import argparse
+import asyncio
 import logging
 import os
-import markdown
-from datetime import datetime
-from multiprocessing import Queue  
-from flask import Flask, render_template, request, jsonify
-from aiortc import RTCPeerConnection, RTCSessionDescription, VideoStreamTrack
-from aiortc.contrib.media import MediaPlayer
-import cv2
-import dlib
-import numpy as np
-
-app = Flask(__name__)
+import time
+import uuid
+
+from aiohttp import web
+from aiortc import RTCPeerConnection, RTCSessionDescription
+
+from proctoring_rtc import AnalysisPool, TrackProctor
+
 logger = logging.getLogger("webrtc-agent")
-log_queue = Queue()
 
 shape_predictor_path = "/Users/yogeshwarcm/Desktop/HydHackathon/Project/agent/shape_predictor_68_face_landmarks.dat"
 alert_sound_path = "/Users/yogeshwarcm/Desktop/HydHackathon/Project/agent/alert.wav"
+index_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "index.html")
 
 if not os.path.exists(shape_predictor_path):
     raise FileNotFoundError(f"Shape predictor file not found: {shape_predictor_path}")
@@ -23,129 +22,159 @@ if not os.path.exists(shape_predictor_path):
 if not os.path.exists(alert_sound_path):
     raise FileNotFoundError(f"Alert sound file not found: {alert_sound_path}")
 
-detector = dlib.get_frontal_face_detector()
-predictor = dlib.shape_predictor(shape_predictor_path)
-
-def eye_aspect_ratio(eye):
-    A = np.linalg.norm(eye[1] - eye[5])
-    B = np.linalg.norm(eye[2] - eye[4])
-    C = np.linalg.norm(eye[0] - eye[3])
-    ear = (A + B) / (2.0 * C)
-    return ear
-
-def is_suspicious(eye_aspect_ratio, threshold=0.2):
-    return eye_aspect_ratio < threshold
-
-def calculate_face_angle(landmarks):
-    left_eye_center = np.mean(landmarks[36:42], axis=0)
-    right_eye_center = np.mean(landmarks[42:48], axis=0)
-    nose_center = landmarks[30]
-
-    dx = right_eye_center[0] - left_eye_center[0]
-    dy = right_eye_center[1] - left_eye_center[1]
-    angle = np.degrees(np.arctan2(dy, dx))
-    return angle
-
-def is_face_within_view(face, frame_width, frame_height):
-    x, y, w, h = face.left(), face.top(), face.width(), face.height()
-    return x > 0 and y > 0 and (x + w) < frame_width and (y + h) < frame_height
-
-def load_company_info(data_folder):
-    company_info = ""
-    for filename in os.listdir(data_folder):
-        if filename.endswith(".md"):
-            filepath = os.path.join(data_folder, filename)
-            with open(filepath, 'r', encoding='utf-8') as file:
-                md_content = file.read()
-                company_info += markdown.markdown(md_content)
-    return company_info
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-@app.route('/offer', methods=['POST'])
-async def offer():
-    params = request.json
-    offer = RTCSessionDescription(sdp=params['sdp'], type=params['type'])
-
-    pc = RTCPeerConnection()
-    pcs.add(pc)
-
-    @pc.on('datachannel')
-    def on_datachannel(channel):
-        @channel.on('message')
-        def on_message(message):
-            print(f"Received message: {message}")
-
-    @pc.on('iceconnectionstatechange')
-    def on_iceconnectionstatechange():
-        if pc.iceConnectionState == 'failed':
-            pc.close()
-            pcs.discard(pc)
-
-    @pc.on('track')
-    def on_track(track):
-        if track.kind == 'video':
-            local_video = VideoStreamTrack()
-            pc.addTrack(local_video)
-
-    await pc.setRemoteDescription(offer)
-    answer = await pc.createAnswer()
-    await pc.setLocalDescription(answer)
-
-    return jsonify({
-        'sdp': pc.localDescription.sdp,
-        'type': pc.localDescription.type
-    })
-
-class VideoStreamTrack(VideoStreamTrack):
-    def __init__(self):
-        super().__init__()
-        self.cap = cv2.VideoCapture(0)
-
-    async def recv(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            return
+MAX_PEERS = int(os.getenv("PROCTORING_MAX_PEERS", "50"))
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = detector(gray)
 
-        frame_height, frame_width = frame.shape[:2]
-        face_detected = False
-
-        for face in faces:
-            face_detected = True
-            landmarks = predictor(gray, face)
-            landmarks = np.array([[p.x, p.y] for p in landmarks.parts()])
+class Peer:
+    """One candidate's peer connection and the proctor consuming its video track."""
+
+    def __init__(self, peer_id, pc):
+        self.peer_id = peer_id
+        self.pc = pc
+        self.proctor = None
+        self.channel = None
+        self.connected_at = time.monotonic()
+
+    async def close(self):
+        if self.proctor is not None:
+            await self.proctor.stop()
+        await self.pc.close()
+
+    def metrics(self):
+        metrics = {
+            "state": self.pc.connectionState,
+            "uptime": time.monotonic() - self.connected_at,
+        }
+        if self.proctor is not None:
+            metrics.update(self.proctor.metrics())
+        return metrics
+
+
+class PeerRegistry:
+    """All live peer connections of the server, bounded by `max_peers`."""
+
+    def __init__(self, analysis_pool, max_peers=MAX_PEERS):
+        self.analysis_pool = analysis_pool
+        self.max_peers = max_peers
+        self.peers = {}
+        self.rejected = 0
+
+    @property
+    def full(self):
+        return len(self.peers) >= self.max_peers
+
+    def create(self):
+        peer = Peer(uuid.uuid4().hex, RTCPeerConnection())
+        self.peers[peer.peer_id] = peer
+        self._attach(peer)
+        return peer
+
+    async def close(self, peer_id):
+        peer = self.peers.pop(peer_id, None)
+        if peer is not None:
+            await peer.close()
+            logger.info(f"Closed peer {peer_id}, {len(self.peers)} active")
+
+    async def close_all(self):
+        await asyncio.gather(*(self.close(peer_id) for peer_id in list(self.peers)))
+
+    def metrics(self):
+        peers = {peer_id: peer.metrics() for peer_id, peer in self.peers.items()}
+        return {
+            "active_peers": len(peers),
+            "max_peers": self.max_peers,
+            "rejected": self.rejected,
+            "frames_per_sec": sum(peer.get("fps", 0.0) for peer in peers.values()),
+            "peers": peers,
+        }
+
+    def _attach(self, peer):
+        pc = peer.pc
+
+        @pc.on('datachannel')
+        def on_datachannel(channel):
+            peer.channel = channel
+            if peer.proctor is not None:
+                peer.proctor.channel = channel
+
+            @channel.on('message')
+            def on_message(message):
+                logger.info(f"Received message from {peer.peer_id}: {message}")
+
+        @pc.on('connectionstatechange')
+        async def on_connectionstatechange():
+            if pc.connectionState in ('failed', 'closed'):
+                await self.close(peer.peer_id)
+
+        @pc.on('track')
+        def on_track(track):
+            if track.kind == 'video' and peer.proctor is None:
+                peer.proctor = TrackProctor(self.analysis_pool, peer.peer_id, track).start()
+                peer.proctor.channel = peer.channel
+
+
+async def index(request):
+    return web.FileResponse(index_path)
+
+
+async def alert_sound(request):
+    return web.FileResponse(alert_sound_path, headers={"Content-Type": "audio/wav"})
+
+
+async def offer(request):
+    registry = request.app["registry"]
+    if registry.full:
+        registry.rejected += 1
+        return web.json_response({"error": "Too many active sessions, try again later"}, status=503)
+
+    params = await request.json()
+    description = RTCSessionDescription(sdp=params['sdp'], type=params['type'])
+    peer = registry.create()
+    try:
+        await peer.pc.setRemoteDescription(description)
+        answer = await peer.pc.createAnswer()
+        await peer.pc.setLocalDescription(answer)
+    except Exception:
+        await registry.close(peer.peer_id)
+        raise
+
+    return web.json_response({
+        'sdp': peer.pc.localDescription.sdp,
+        'type': peer.pc.localDescription.type
+    })
 
-            left_eye = landmarks[36:42]
-            right_eye = landmarks[42:48]
 
-            left_ear = eye_aspect_ratio(left_eye)
-            right_ear = eye_aspect_ratio(right_eye)
+async def metrics(request):
+    return web.json_response(request.app["registry"].metrics())
 
-            ear = (left_ear + right_ear) / 2.0
 
-            if is_suspicious(ear):
-                cv2.putText(frame, "Suspicious activity detected!", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+async def on_shutdown(app):
+    await app["registry"].close_all()
 
-            cv2.polylines(frame, [left_eye], True, (0, 255, 0), 1)
-            cv2.polylines(frame, [right_eye], True, (0, 255, 0), 1)
 
-            angle = calculate_face_angle(landmarks)
-            cv2.putText(frame, f"Face angle: {angle:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+async def on_cleanup(app):
+    app["registry"].analysis_pool.shutdown()
 
-            if not is_face_within_view(face, frame_width, frame_height):
-                cv2.putText(frame, "Please stay within the camera view!", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                playsound(alert_sound_path)
 
-        if not face_detected:
-            cv2.putText(frame, "No face detected! Please stay in front of the camera.", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            playsound(alert_sound_path)
+def create_app(max_peers=MAX_PEERS, workers=None):
+    app = web.Application()
+    app["registry"] = PeerRegistry(AnalysisPool(shape_predictor_path, workers=workers), max_peers=max_peers)
+    app.router.add_get('/', index)
+    app.router.add_get('/alert.wav', alert_sound)
+    app.router.add_post('/offer', offer)
+    app.router.add_get('/metrics', metrics)
+    app.on_shutdown.append(on_shutdown)
+    app.on_cleanup.append(on_cleanup)
+    return app
 
-        return frame
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=3000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="WebRTC proctoring server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--max-peers", type=int, default=MAX_PEERS)
+    parser.add_argument("--workers", type=int, default=None, help="analysis processes (default: all cores)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(create_app(args.max_peers, args.workers), host=args.host, port=args.port)